@@ -10,6 +10,7 @@ import config # noqa
 from sqlalchemy.orm import Session
 import logging
 from common.helpers import device_location as DeviceLocationHelper
+from common.helpers import geometry_engine as GeometryEngine
 from helpers.responses_documentation.location_verification_api import (
     LocationVerificationResponses,
 )
@@ -80,31 +81,28 @@ async def verify_location(
 
     # This API assumes that an UE are is always a circle, and never
     # a polygon
-    # Get the radius of the simulated UE
-    radius = DeviceLocationHelper.generate_random_radius(
+    ue_area = GeometryEngine.ue_area_from_coordinates(
         latitude=device_location_data.latitude,
         longitude=device_location_data.longitude
     )
 
-    # Create a shapely circle area for the UE
-    ue_area = DeviceLocationHelper.shapely_circle_from_coordinates_circle(
-        center_latitude=device_location_data.latitude,
-        center_longitude=device_location_data.longitude,
-        radius_meters=radius
-    )
-
-    shapely_desired_area = DeviceLocationHelper.shapely_polygon_from_area(
+    desired_area = GeometryEngine.area_from_pydantic_area(
         area=verify_location_request.area
     )
 
-    verification_result = DeviceLocationHelper\
-        .compute_location_verification_result(
-            device=ue_area,
-            area=shapely_desired_area
-        )
+    verification_result, ratio = GeometryEngine.locate(
+        ue_area=ue_area,
+        area=desired_area,
+        with_match_rate=True
+    )
 
-    # Update the UE timestamp
-    verification_result.last_location_time = device_location_data.timestamp\
-        .strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    response = VerifyLocationResponse(
+        last_location_time=device_location_data.timestamp
+        .strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        verification_result=verification_result
+    )
+    # The match rate is only reported for partial matches
+    if verification_result == VerificationResult.PARTIAL:
+        response.match_rate = GeometryEngine.match_rate_from_ratio(ratio)
 
-    return verification_result
+    return response
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 16:34:48
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 16:34:48
+
+import pytest
+import config # noqa
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from common.database import crud
+from common.database import models
+
+SIMULATIONS = 50
+INSTANCES_PER_SIMULATION = 2
+UES_PER_SIMULATION = 10
+ENTRIES_PER_UE = 10
+
+# Queried entities (the last ones of each table)
+ROOT_SIMULATION = SIMULATIONS
+SIMULATION_INSTANCE = SIMULATIONS * INSTANCES_PER_SIMULATION
+CHILD_SIMULATION_INSTANCE = SIMULATION_INSTANCE
+SIMULATION_UE = SIMULATIONS * UES_PER_SIMULATION
+SIMULATION_UE_INSTANCE = SIMULATION_INSTANCE * UES_PER_SIMULATION
+PHONE_NUMBER = f"+{SIMULATION_UE}"
+
+
+def seed_database(db):
+    now = datetime.utcnow()
+    simulations, instances, children, ues, ue_instances = [], [], [], [], []
+    locations, sim_swaps, statuses, platforms = [], [], [], []
+    location_subscriptions, status_subscriptions = [], []
+
+    for simulation in range(1, SIMULATIONS + 1):
+        simulations.append({"id": simulation, "name": f"{simulation}"})
+        platforms.append({"root_simulation": simulation})
+
+        simulation_ues = []
+        for i in range(UES_PER_SIMULATION):
+            ue = (simulation - 1) * UES_PER_SIMULATION + i + 1
+            simulation_ues.append(ue)
+            ues.append(
+                {
+                    "id": ue,
+                    "root_simulation": simulation,
+                    "phone_number": f"+{ue}",
+                }
+            )
+            for subscriptions in (
+                location_subscriptions, status_subscriptions
+            ):
+                subscriptions.append(
+                    {
+                        "id": f"{ue}",
+                        "root_simulation": simulation,
+                        "ue": ue,
+                        "expire_time": now + timedelta(hours=1),
+                    }
+                )
+
+        for j in range(INSTANCES_PER_SIMULATION):
+            instance = (simulation - 1) * INSTANCES_PER_SIMULATION + j + 1
+            instances.append(
+                {"id": instance, "root_simulation": simulation}
+            )
+            # Only the last simulation instance is still running
+            children.append(
+                {
+                    "id": instance,
+                    "simulation_instance": instance,
+                    "end_timestamp": None
+                    if instance == SIMULATION_INSTANCE
+                    else now - timedelta(minutes=instance),
+                }
+            )
+
+            for i, ue in enumerate(simulation_ues):
+                ue_instance = (instance - 1) * UES_PER_SIMULATION + i + 1
+                ue_instances.append(
+                    {
+                        "id": ue_instance,
+                        "simulation_instance": instance,
+                        "simulation_ue": ue,
+                    }
+                )
+                row = {
+                    "simulation_instance": instance,
+                    "child_simulation_instance": instance,
+                    "ue": ue_instance,
+                }
+                for _ in range(ENTRIES_PER_UE):
+                    locations.append(row)
+                    sim_swaps.append(row)
+                    statuses.append(row)
+
+    for model, rows in (
+        (models.Simulation, simulations),
+        (models.SimulationInstance, instances),
+        (models.ChildSimulationInstance, children),
+        (models.SimulationUE, ues),
+        (models.SimulationUEInstance, ue_instances),
+        (models.SimulationMecPlatform, platforms),
+        (models.DeviceLocationSubscription, location_subscriptions),
+        (models.DeviceStatusSubscription, status_subscriptions),
+    ):
+        db.execute(insert(model), rows)
+
+    crud.create_simulation_data_entries(
+        db,
+        {
+            models.DeviceLocationSimulationData: locations,
+            models.SimSwapSimulationData: sim_swaps,
+            models.DeviceStatusSimulationData: statuses,
+        }
+    )
+    # Let the query planner know the tables' sizes
+    db.connection().exec_driver_sql("ANALYZE")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(bind=engine)
+
+    db = sessionmaker(bind=engine)()
+    seed_database(db)
+    db.commit()
+    db.close()
+
+    return engine
+
+
+GETTERS = {
+    "get_simulation": lambda db: crud.get_simulation(
+        db, ROOT_SIMULATION
+    ),
+    "get_simulation_instance_from_child": lambda db: crud
+    .get_simulation_instance_from_child(db, CHILD_SIMULATION_INSTANCE),
+    "simulation_is_running": lambda db: crud.simulation_is_running(
+        db, simulation_id=ROOT_SIMULATION
+    ),
+    "get_last_simulation_instance_from_root_simulation": lambda db: crud
+    .get_last_simulation_instance_from_root_simulation(db, ROOT_SIMULATION),
+    "get_child_simulation_instances_from_root_simulation": lambda db: crud
+    .get_child_simulation_instances_from_root_simulation(
+        db, ROOT_SIMULATION
+    ),
+    "get_simulated_device_instance_from_root_simulation": lambda db: crud
+    .get_simulated_device_instance_from_root_simulation(
+        db, ROOT_SIMULATION, SimpleNamespace(phone_number=PHONE_NUMBER)
+    ),
+    "get_device_instance_based_on_simulated_ue": lambda db: crud
+    .get_device_instance_based_on_simulated_ue(
+        db, ROOT_SIMULATION, SIMULATION_UE
+    ),
+    "get_simulated_device_instance_from_root_simulation_via_phone_number":
+    lambda db: crud
+    .get_simulated_device_instance_from_root_simulation_via_phone_number(
+        db, ROOT_SIMULATION, PHONE_NUMBER
+    ),
+    "get_simulated_device_based_on_phone_number": lambda db: crud
+    .get_simulated_device_based_on_phone_number(
+        db, ROOT_SIMULATION, PHONE_NUMBER
+    ),
+    "get_simulated_device_based_on_several_parameters": lambda db: crud
+    .get_simulated_device_based_on_several_parameters(
+        db, ROOT_SIMULATION, PHONE_NUMBER, None, None
+    ),
+    "get_simulated_device_from_id": lambda db: crud
+    .get_simulated_device_from_id(db, SIMULATION_UE),
+    "get_simulated_device_id_from_simulated_device_instance": lambda db: crud
+    .get_simulated_device_id_from_simulated_device_instance(
+        db, SIMULATION_UE_INSTANCE
+    ),
+    "get_device_location_simulation_data": lambda db: crud
+    .get_device_location_simulation_data(
+        db, ROOT_SIMULATION, ue_id=SIMULATION_UE_INSTANCE
+    ),
+    "get_sim_swap_simulation_data": lambda db: crud
+    .get_sim_swap_simulation_data(
+        db, ROOT_SIMULATION, ue_id=SIMULATION_UE_INSTANCE
+    ),
+    "get_last_device_status_entry": lambda db: crud
+    .get_last_device_status_entry(
+        db, SIMULATION_INSTANCE, SIMULATION_UE_INSTANCE
+    ),
+    "get_mec_platforms_for_root_simulation": lambda db: crud
+    .get_mec_platforms_for_root_simulation(db, ROOT_SIMULATION),
+    "get_all_child_simulation_instances_running": lambda db: crud
+    .get_all_child_simulation_instances_running(db),
+    "get_device_location_subscriptions_for_root_simulation": lambda db: crud
+    .get_device_location_subscriptions_for_root_simulation(
+        db, ROOT_SIMULATION
+    ),
+    "get_active_device_location_subscriptions_for_root_simulation":
+    lambda db: crud
+    .get_active_device_location_subscriptions_for_root_simulation(
+        db, ROOT_SIMULATION
+    ),
+    "get_device_location_subscription_for_root_simulation": lambda db: crud
+    .get_device_location_subscription_for_root_simulation(
+        db, ROOT_SIMULATION, f"{SIMULATION_UE}"
+    ),
+    "get_device_status_subscriptions_for_root_simulation": lambda db: crud
+    .get_device_status_subscriptions_for_root_simulation(
+        db, ROOT_SIMULATION
+    ),
+    "get_active_device_status_subscriptions_for_root_simulation":
+    lambda db: crud
+    .get_active_device_status_subscriptions_for_root_simulation(
+        db, ROOT_SIMULATION
+    ),
+    "get_device_status_subscription_for_root_simulation": lambda db: crud
+    .get_device_status_subscription_for_root_simulation(
+        db, ROOT_SIMULATION, f"{SIMULATION_UE}"
+    ),
+}
+
+
+@pytest.mark.parametrize('getter', GETTERS.keys())
+def test_crud_getters_do_not_scan_tables(getter, engine):
+    # Record every statement executed by the getter
+    statements = []
+
+    def record_statement(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    db = sessionmaker(bind=engine)()
+    try:
+        GETTERS[getter](db)
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+    assert statements
+
+    for statement, parameters in statements:
+        query_plan = db.connection().exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}",
+            parameters
+        ).all()
+
+        # SQLite reports a full table (or index) scan as 'SCAN <table>',
+        # while an index lookup is reported as 'SEARCH <table> USING ...'
+        for _, _, _, detail in query_plan:
+            assert not detail.startswith("SCAN"), \
+                f"{getter} scans a table: {detail}"
+
+    db.close()
@@ -9,8 +9,12 @@ import pytest
 from common.helpers import (
     device_location as DeviceLocationHelper
 )
+from common.helpers import geometry_engine as GeometryEngine
 from common.apis.device_location_schemas import (
-    VerificationResult
+    VerificationResult,
+    Circle,
+    Point,
+    Polygon
 )
 
 
@@ -56,69 +60,187 @@ def test_get_utm_zone_from_coordinates(
     'device, area, expected_verification_result, expected_match_rate',
     [
         (
-            DeviceLocationHelper.shapely_circle_from_coordinates_circle(
-                center_latitude=40.63148536954102,
-                center_longitude=-8.657291163208452,
-                radius_meters=20
+            GeometryEngine.CircleArea.from_coordinates(
+                latitude=40.63148536954102,
+                longitude=-8.657291163208452,
+                radius=20
             ),
-            DeviceLocationHelper.shapely_circle_from_coordinates_circle(
-                center_latitude=40.631221426476856,
-                center_longitude=-8.656918534018967,
-                radius_meters=20
+            GeometryEngine.CircleArea.from_coordinates(
+                latitude=40.631221426476856,
+                longitude=-8.656918534018967,
+                radius=20
             ),
             VerificationResult.FALSE,
             None
         ),
         (
-            DeviceLocationHelper.shapely_circle_from_coordinates_circle(
-                center_latitude=40.63148536954102,
-                center_longitude=-8.657291163208452,
-                radius_meters=24
+            GeometryEngine.CircleArea.from_coordinates(
+                latitude=40.63148536954102,
+                longitude=-8.657291163208452,
+                radius=24
             ),
-            DeviceLocationHelper.shapely_circle_from_coordinates_circle(
-                center_latitude=40.631221426476856,
-                center_longitude=-8.656918534018967,
-                radius_meters=20
+            GeometryEngine.CircleArea.from_coordinates(
+                latitude=40.631221426476856,
+                longitude=-8.656918534018967,
+                radius=20
             ),
             VerificationResult.PARTIAL,
             1
         ),
         (
-            DeviceLocationHelper.shapely_circle_from_coordinates_circle(
-                center_latitude=40.63148536954102,
-                center_longitude=-8.657291163208452,
-                radius_meters=10
+            GeometryEngine.CircleArea.from_coordinates(
+                latitude=40.63148536954102,
+                longitude=-8.657291163208452,
+                radius=10
             ),
-            DeviceLocationHelper.shapely_circle_from_coordinates_circle(
-                center_latitude=40.631221426476856,
-                center_longitude=-8.656918534018967,
-                radius_meters=40
+            GeometryEngine.CircleArea.from_coordinates(
+                latitude=40.631221426476856,
+                longitude=-8.656918534018967,
+                radius=40
             ),
             VerificationResult.PARTIAL,
             29
         ),
         (
-            DeviceLocationHelper.shapely_circle_from_coordinates_circle(
-                center_latitude=40.63148536954102,
-                center_longitude=-8.657291163208452,
-                radius_meters=10
+            GeometryEngine.CircleArea.from_coordinates(
+                latitude=40.63148536954102,
+                longitude=-8.657291163208452,
+                radius=10
             ),
-            DeviceLocationHelper.shapely_circle_from_coordinates_circle(
-                center_latitude=40.631221426476856,
-                center_longitude=-8.656918534018967,
-                radius_meters=58
+            GeometryEngine.CircleArea.from_coordinates(
+                latitude=40.631221426476856,
+                longitude=-8.656918534018967,
+                radius=58
             ),
             VerificationResult.TRUE,
             None
         ),
     ]
 )
-def test_compute_location_verification_result(
+def test_locate_circle_in_circle(
     device, area, expected_verification_result, expected_match_rate
 ):
-    result = DeviceLocationHelper.compute_location_verification_result(
-        device=device,
-        area=area
+    verification_result, ratio = GeometryEngine.locate(
+        ue_area=device,
+        area=area,
+        with_match_rate=True
     )
-    assert result.verification_result == expected_verification_result
-    assert result.match_rate == expected_match_rate
+    assert verification_result == expected_verification_result
+    if expected_match_rate is None:
+        assert ratio is None
+    else:
+        assert GeometryEngine.match_rate_from_ratio(ratio) == \
+            expected_match_rate
+
+
+@pytest.mark.parametrize(
+    'ue_radius, area, expected_verification_result, expected_match_rate',
+    [
+        (
+            20,
+            Circle(
+                area_type="circle",
+                center=Point(
+                    latitude=40.631221426476856,
+                    longitude=-8.656918534018967
+                ),
+                radius=20
+            ),
+            VerificationResult.FALSE,
+            None
+        ),
+        (
+            10,
+            Circle(
+                area_type="circle",
+                center=Point(
+                    latitude=40.631221426476856,
+                    longitude=-8.656918534018967
+                ),
+                radius=40
+            ),
+            VerificationResult.PARTIAL,
+            29
+        ),
+        (
+            10,
+            Circle(
+                area_type="circle",
+                center=Point(
+                    latitude=40.631221426476856,
+                    longitude=-8.656918534018967
+                ),
+                radius=58
+            ),
+            VerificationResult.TRUE,
+            None
+        ),
+        (
+            10,
+            Polygon(
+                area_type="polygon",
+                boundary=[
+                    Point(latitude=40.6310, longitude=-8.6580),
+                    Point(latitude=40.6320, longitude=-8.6580),
+                    Point(latitude=40.6320, longitude=-8.6565),
+                    Point(latitude=40.6310, longitude=-8.6565),
+                ]
+            ),
+            VerificationResult.TRUE,
+            None
+        ),
+        (
+            10,
+            Polygon(
+                area_type="polygon",
+                boundary=[
+                    Point(latitude=40.6310, longitude=-8.6580),
+                    Point(latitude=40.6320, longitude=-8.6580),
+                    Point(latitude=40.6320, longitude=-8.657291163208452),
+                    Point(latitude=40.6310, longitude=-8.657291163208452),
+                ]
+            ),
+            VerificationResult.PARTIAL,
+            50
+        ),
+        (
+            10,
+            Polygon(
+                area_type="polygon",
+                boundary=[
+                    Point(latitude=40.6300, longitude=-8.6580),
+                    Point(latitude=40.6305, longitude=-8.6580),
+                    Point(latitude=40.6305, longitude=-8.6565),
+                    Point(latitude=40.6300, longitude=-8.6565),
+                ]
+            ),
+            VerificationResult.FALSE,
+            None
+        ),
+    ]
+)
+def test_locate_ue_area(
+    ue_radius, area, expected_verification_result, expected_match_rate
+):
+    ue_area = GeometryEngine.CircleArea.from_coordinates(
+        latitude=40.63148536954102,
+        longitude=-8.657291163208452,
+        radius=ue_radius
+    )
+    verification_result, ratio = GeometryEngine.locate(
+        ue_area=ue_area,
+        area=GeometryEngine.area_from_pydantic_area(area),
+        with_match_rate=True
+    )
+    assert verification_result == expected_verification_result
+    if expected_match_rate is None:
+        assert ratio is None
+    else:
+        assert GeometryEngine.match_rate_from_ratio(ratio) == \
+            expected_match_rate
+
+    # The match rate is only computed when asked
+    assert GeometryEngine.locate(
+        ue_area=ue_area,
+        area=GeometryEngine.area_from_pydantic_area(area)
+    ) == (expected_verification_result, None)
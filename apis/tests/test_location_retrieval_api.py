@@ -7,7 +7,14 @@
 import pytest
 import json
 import config # noqa
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from common.database import crud
 from common.database import models
+from common.database import migrations
+from common.database import connections_factory as DBFactory
+from common.helpers import device_location as DeviceLocationHelper
 from fastapi.testclient import TestClient
 from apis.main import device_location_retrieval_app
 from datetime import datetime, timedelta
@@ -248,3 +255,90 @@ def test_simulation_not_running_responses_in_verify_endpoint(
     assert response_data["code"] == 'SIMULATION.NOT_RUNNING'
     assert response_data["message"] == 'The simulation is not running. '\
         'Thus, you cannot get its generated data'
+
+
+def test_initial_location_is_retrieved_after_starting_simulation(mocker):
+    initial_location = {
+        "latitude": 40.63148536954102,
+        "longitude": -8.657291163208452
+    }
+    payload = {
+        "name": "Simulation",
+        "description": "Simulation",
+        "devices": [
+            {
+                "id": "1",
+                "phone_number": REQUEST_DATA["device"]["phoneNumber"]
+            }
+        ],
+        "child_simulations": [
+            {
+                "simulation_type": "DEVICE_LOCATION",
+                "devices": ["1"],
+                "duration": 60,
+                "itinerary": [
+                    initial_location,
+                    {"latitude": 40.6320, "longitude": -8.6580}
+                ]
+            }
+        ]
+    }
+
+    # The API and the test share a single in-memory database
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    simulation = crud.create_simulation(
+        db=db,
+        name=payload["name"],
+        description=payload["description"],
+        duration_seconds=60,
+        devices=DeviceLocationHelper
+        .parse_payload_ues_to_simulated_ue_objects(payload["devices"]),
+        mec_platforms=[],
+        payload=json.dumps(json.dumps(payload))
+    )
+    assert crud.create_simulation_entities_required_for_starting_simulation(
+        db=db,
+        simulation=simulation
+    )
+
+    mocker.patch(
+        target="common.database.crud.simulation_is_running",
+        return_value=True
+    )
+    device_location_retrieval_app.dependency_overrides[
+        DBFactory.get_db_session
+    ] = lambda: db
+
+    try:
+        # No location was generated yet, so the initial one is retrieved
+        response = client.post(
+            url=API_URL,
+            headers={"simulation-id": f"{simulation.id}"},
+            data=json.dumps(REQUEST_DATA)
+        )
+        assert response.status_code == 200
+        assert response.json()["area"]["center"] == initial_location
+
+        # Databases created before the latest tables are backfilled from
+        # the history tables
+        db.execute(delete(models.DeviceLocationLatest))
+        db.commit()
+        migrations.backfill_latest_tables(engine)
+
+        response = client.post(
+            url=API_URL,
+            headers={"simulation-id": f"{simulation.id}"},
+            data=json.dumps(REQUEST_DATA)
+        )
+        assert response.status_code == 200
+        assert response.json()["area"]["center"] == initial_location
+    finally:
+        device_location_retrieval_app.dependency_overrides.clear()
+        db.close()
@@ -5,12 +5,13 @@
 # @Last Modified time: 2023-12-26 17:53:06
 from celery import Celery
 from celery.schedules import crontab
-from datetime import datetime, timedelta
+from datetime import timedelta
 import config # noqa
 import logging
 from common.message_broker import constants as Constants
 from common.database import connections_factory as DBFactory
 from common.database import crud
+from common.simulation.clock import clock as SimulationClock
 
 
 # Create the Celery App
@@ -39,7 +40,7 @@ def cleanup_miss_stopped_child_simulation():
 
         # Check is simulation should have been listed has stopped but wasn't
         # (due to a mistake)
-        if (datetime.utcnow() > maximum_end_timestamp):
+        if (SimulationClock.utcnow() > maximum_end_timestamp):
             logging.info(
                 f"Child Simulation Instance {child_sim_inst.id}  (Simulation "
                 f"Instance {child_sim_inst.simulation_instance}) should " +
@@ -52,7 +53,7 @@ def cleanup_miss_stopped_child_simulation():
             crud.update_child_simulation_end_timestamp(
                 db=db,
                 child_simulation_id=child_sim_inst.id,
-                end_timestamp=datetime.utcnow()
+                end_timestamp=SimulationClock.utcnow()
             )
 
     if ALL_SIMULATION_OK:
@@ -49,7 +49,11 @@ class DeviceLocationSimulation(BaseModel):
     )
     devices: List[str]
     duration: int  # in seconds
-    itinerary: List[ItineraryStop]
+    # The UEs start at the first stop. Thus, there must be at least one
+    itinerary: List[ItineraryStop] = Field(min_length=1)
+    # Road graph used to compute the itineraries. If not set, the default
+    # region graph will be used
+    region: Optional[str] = Field(default=None)
 
 
 class SIMSwapSimulation(BaseModel):
@@ -7,6 +7,7 @@
 
 from common.database import models
 from common.database import database
+from common.database import migrations
 import time
 import logging
 import sys
@@ -20,6 +21,8 @@ if "pytest" not in sys.modules:
     for i in range(10):
         try:
             models.Base.metadata.create_all(bind=database.engine)
+            migrations.create_missing_indexes(database.engine)
+            migrations.backfill_latest_tables(database.engine)
             MODELS_INITIALIZED = True
             logging.info("All Database models have been initialized!")
             break
@@ -3,8 +3,13 @@
 # @Date:   2023-12-11 11:34:16
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2023-12-11 20:58:08
+from contextlib import contextmanager
+from sqlalchemy.orm import scoped_session
 from common.database.database import SessionLocal
 
+# Registry of sessions, with one session per thread
+ScopedSession = scoped_session(SessionLocal)
+
 
 def new_db_session():
     db = SessionLocal()
@@ -20,3 +25,18 @@ def get_db_session():
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def session_scope():
+    # Short-lived unit of work, on the calling thread's session. The session
+    # is discarded at the end, so that the next unit of work starts clean
+    db = ScopedSession()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        ScopedSession.remove()
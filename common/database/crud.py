@@ -15,9 +15,10 @@ from common.apis.device_location_schemas import (
 from common.apis.device_status_schemas import (
     CreateSubscription as DeviceStatusCreateSubscription
 )
-from datetime import datetime
+from common.simulation.clock import clock as SimulationClock
 import copy
-from sqlalchemy import or_
+from sqlalchemy import or_, insert
+from sqlalchemy.dialects import postgresql, sqlite
 
 
 def create_simulation(
@@ -215,6 +216,12 @@ def create_device_location_simulation_data_entry(
         )
 
     db.add(new_device_location_simulation_entry)
+    db.flush()
+    upsert_latest_simulation_data_entries(
+        db,
+        models.DeviceLocationSimulationData,
+        [simulation_data_entry_to_row(new_device_location_simulation_entry)]
+    )
     db.commit()
     db.refresh(new_device_location_simulation_entry)
 
@@ -535,11 +542,16 @@ def create_simulation_entities_required_for_starting_simulation(
                             ue=devices_mapping[device].id,
                             latitude=initial_location["latitude"],
                             longitude=initial_location["longitude"],
-                            timestamp=datetime.utcnow(),
+                            timestamp=SimulationClock.utcnow(),
                         )
 
                     db.add(simulation_entry)
                     db.flush()
+                    upsert_latest_simulation_data_entries(
+                        db,
+                        models.DeviceLocationSimulationData,
+                        [simulation_data_entry_to_row(simulation_entry)]
+                    )
 
                     logging.info(
                         "Created new device location simulation data entry " +
@@ -596,11 +608,16 @@ def create_simulation_entities_required_for_starting_simulation(
                             simulation_instance=new_simulation_instance.id,
                             ue=devices_mapping[device].id,
                             new_msisdn="initial_msisdn",
-                            timestamp=datetime.utcnow()
+                            timestamp=SimulationClock.utcnow()
                         )
 
                     db.add(sim_swap_entry)
                     db.flush()
+                    upsert_latest_simulation_data_entries(
+                        db,
+                        models.SimSwapSimulationData,
+                        [simulation_data_entry_to_row(sim_swap_entry)]
+                    )
 
                     logging.info(
                         "Created new initial Swap simulation data entry for " +
@@ -680,6 +697,11 @@ def create_simulation_entities_required_for_starting_simulation(
 
                     db.add(device_status_entry)
                     db.flush()
+                    upsert_latest_simulation_data_entries(
+                        db,
+                        models.DeviceStatusSimulationData,
+                        [simulation_data_entry_to_row(device_status_entry)]
+                    )
 
                     logging.info(
                         "Created new initial Device Status data entry for " +
@@ -884,13 +906,12 @@ def get_device_location_simulation_data(
         root_simulation_id=root_simulation_id
     )
 
-    return db.query(models.DeviceLocationSimulationData).filter(
-        models.DeviceLocationSimulationData.simulation_instance ==
-        simulation_instance.id,
-        models.DeviceLocationSimulationData.ue == ue_id
-    ).order_by(
-        models.DeviceLocationSimulationData.id.desc()
-    ).first()
+    # Long-lived sessions must not get a stale entry from the identity map
+    return db.get(
+        models.DeviceLocationLatest,
+        (simulation_instance.id, ue_id),
+        populate_existing=True
+    )
 
 
 def create_device_location_subscription(
@@ -907,7 +928,7 @@ def create_device_location_subscription(
         subscription_type=subscription.subscription_detail.type.value,
         webhook_url=subscription.webhook.notification_url,
         webhook_auth_token=subscription.webhook.notification_auth_token,
-        start_time=datetime.utcnow(),
+        start_time=SimulationClock.utcnow(),
         expire_time=subscription.subscription_expire_time
     )
 
@@ -935,7 +956,8 @@ def get_active_device_location_subscriptions_for_root_simulation(
     db: Session, root_simulation_id: int
 ):
     return db.query(models.DeviceLocationSubscription).filter(
-        models.DeviceLocationSubscription.expire_time > datetime.utcnow(),
+        models.DeviceLocationSubscription.expire_time >
+        SimulationClock.utcnow(),
         models.DeviceLocationSubscription.root_simulation == root_simulation_id
     ).all()
 
@@ -1028,6 +1050,12 @@ def create_sim_swap_simulation_data_entry(
         )
 
     db.add(new_sim_swap_simulation_entry)
+    db.flush()
+    upsert_latest_simulation_data_entries(
+        db,
+        models.SimSwapSimulationData,
+        [simulation_data_entry_to_row(new_sim_swap_simulation_entry)]
+    )
     db.commit()
     db.refresh(new_sim_swap_simulation_entry)
 
@@ -1055,13 +1083,12 @@ def get_sim_swap_simulation_data(
         root_simulation_id=root_simulation_id
     )
 
-    return db.query(models.SimSwapSimulationData).filter(
-        models.SimSwapSimulationData.simulation_instance ==
-        simulation_instance.id,
-        models.SimSwapSimulationData.ue == ue_id
-    ).order_by(
-        models.SimSwapSimulationData.id.desc()
-    ).first()
+    # Long-lived sessions must not get a stale entry from the identity map
+    return db.get(
+        models.SimSwapLatest,
+        (simulation_instance.id, ue_id),
+        populate_existing=True
+    )
 
 
 def get_mec_platforms_for_root_simulation(
@@ -1092,6 +1119,12 @@ def create_device_status_simulation_data_entry(
         )
 
     db.add(new_device_status_simulation_entry)
+    db.flush()
+    upsert_latest_simulation_data_entries(
+        db,
+        models.DeviceStatusSimulationData,
+        [simulation_data_entry_to_row(new_device_status_simulation_entry)]
+    )
     db.commit()
     db.refresh(new_device_status_simulation_entry)
 
@@ -1112,18 +1145,87 @@ def create_device_status_simulation_data_entry(
     return new_device_status_simulation_entry
 
 
+# Dialects whose inserts support ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def simulation_data_entry_to_row(entry):
+    return {
+        column.name: getattr(entry, column.name)
+        for column in entry.__table__.columns
+        if column.name != "id"
+    }
+
+
+def upsert_latest_simulation_data_entries(db: Session, model, rows):
+    # Upserts the last row of each (simulation instance, UE) in the latest
+    # table of the simulation data model. The transaction is not committed
+    latest_model = models.LATEST_TABLES[model]
+    latest_rows = list({
+        (row["simulation_instance"], row["ue"]): row
+        for row in rows
+    }.values())
+
+    if not latest_rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect not in UPSERT_INSERTS:
+        for row in latest_rows:
+            db.merge(latest_model(**row))
+        return
+
+    statement = UPSERT_INSERTS[dialect](latest_model)
+    statement = statement.on_conflict_do_update(
+        index_elements=[
+            latest_model.simulation_instance,
+            latest_model.ue
+        ],
+        set_={
+            column.name: statement.excluded[column.name]
+            for column in latest_model.__table__.columns
+            if not column.primary_key
+        }
+    )
+    db.execute(statement, latest_rows)
+
+
+def create_simulation_data_entries(db: Session, entries):
+    # Bulk inserts the simulation data rows, given as a dict that maps each
+    # simulation data model to a list of rows. All rows are inserted in a
+    # single transaction, through an executemany per model
+    try:
+        for model, rows in entries.items():
+            if rows:
+                db.execute(insert(model), rows)
+                upsert_latest_simulation_data_entries(db, model, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    logging.info(
+        "Created simulation data entries: " +
+        ", ".join(
+            f"{len(rows)} {model.__tablename__}"
+            for model, rows in entries.items()
+        )
+    )
+
+
 def get_last_device_status_entry(
     db: Session, simulation_instance, ue_id
 ):
-    # Query the database to find the most recent entry for the given parameters
-    return db.query(models.DeviceStatusSimulationData)\
-        .filter(
-            models.DeviceStatusSimulationData.simulation_instance ==
-            simulation_instance,
-            models.DeviceStatusSimulationData.ue == ue_id
-        ).order_by(
-            models.DeviceStatusSimulationData.id.desc()
-        ).first()
+    # The most recent entry is kept in the latest table
+    # Long-lived sessions must not get a stale entry from the identity map
+    return db.get(
+        models.DeviceStatusLatest,
+        (simulation_instance, ue_id),
+        populate_existing=True
+    )
 
 
 def create_device_status_subscription(
@@ -1137,7 +1239,7 @@ def create_device_status_subscription(
         subscription_type=subscription.subscription_detail.type.value,
         webhook_url=subscription.webhook.notification_url,
         webhook_auth_token=subscription.webhook.notification_auth_token,
-        start_time=datetime.utcnow(),
+        start_time=SimulationClock.utcnow(),
         expire_time=subscription.subscription_expire_time
     )
 
@@ -1165,7 +1267,7 @@ def get_active_device_status_subscriptions_for_root_simulation(
     db: Session, root_simulation_id: int
 ):
     return db.query(models.DeviceStatusSubscription).filter(
-        models.DeviceStatusSubscription.expire_time > datetime.utcnow(),
+        models.DeviceStatusSubscription.expire_time > SimulationClock.utcnow(),
         models.DeviceStatusSubscription.root_simulation == root_simulation_id
     ).all()
 
@@ -1224,4 +1326,4 @@ def update_device_status_subscription_notification(
     db.commit()
     db.refresh(notification)
 
-    return notification
\ No newline at end of file
+    return notification
@@ -3,27 +3,61 @@
 # @Date:   2023-12-08 17:47:10
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2023-12-17 16:25:17
-import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from common.database import constants as Constants
 import time
 import logging
 
-ROOT_DIR = os.path.dirname(
-    os.path.dirname(
-        os.path.dirname(os.path.abspath(__file__))
-    )
-)
-print("ROOT_DIR:", ROOT_DIR)
+print("ROOT_DIR:", Constants.ROOT_DIR)
 DB_OK = False
-DB_LOCATION = os.path.join(ROOT_DIR, "database.db")
 
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_LOCATION}"
+SQLALCHEMY_DATABASE_URL = Constants.DATABASE_URL
+
+
+def engine_options(url):
+    # Keyword arguments of create_engine, according to the database's
+    # dialect
+    if make_url(url).get_backend_name() == "sqlite":
+        # SQLite connections are cheap, so the default pool is kept
+        return {
+            "connect_args": {
+                "timeout": Constants.SQLITE_BUSY_TIMEOUT_MS / 1000
+            }
+        }
+
+    return {
+        "pool_size": Constants.DATABASE_POOL_SIZE,
+        "max_overflow": Constants.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": Constants.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": Constants.DATABASE_POOL_RECYCLE,
+        # Replace the connections closed by the server
+        "pool_pre_ping": True,
+    }
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={Constants.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={Constants.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={Constants.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={Constants.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def create_database_engine(url):
+    new_engine = create_engine(url, **engine_options(url))
+    if new_engine.dialect.name == "sqlite":
+        event.listen(new_engine, "connect", set_sqlite_pragmas)
+    return new_engine
+
+
 for i in range(10):
     try:
         logging.info("Trying to connect to the DB.")
-        engine = create_engine(SQLALCHEMY_DATABASE_URL)
+        engine = create_database_engine(SQLALCHEMY_DATABASE_URL)
         SessionLocal = sessionmaker(
             autocommit=False,
             autoflush=False,
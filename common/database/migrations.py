@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 16:20:05
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 20:05:31
+import logging
+from sqlalchemy import exists, func, insert, select
+from common.database import models
+
+
+def create_missing_indexes(engine):
+    # create_all only creates the indexes of the tables it creates. Thus,
+    # the indexes added to the models of already existing tables are
+    # created here
+    for table in models.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+            logging.debug(f"The index '{index.name}' is available.")
+
+
+def backfill_latest_tables(engine):
+    # The latest tables are only kept up to date from the moment they exist.
+    # Thus, the last entry of each (simulation instance, UE) of the running
+    # child simulations is copied from the history tables, if missing
+    running_child_simulation_instances = select(
+        models.ChildSimulationInstance.id
+    ).where(models.ChildSimulationInstance.end_timestamp.is_(None))
+
+    with engine.begin() as connection:
+        for model, latest_model in models.LATEST_TABLES.items():
+            columns = [
+                column.name for column in latest_model.__table__.columns
+            ]
+            last_entries_ids = select(func.max(model.id)).where(
+                model.child_simulation_instance.in_(
+                    running_child_simulation_instances
+                )
+            ).group_by(model.simulation_instance, model.ue)
+
+            missing_entries = select(
+                *[model.__table__.c[column] for column in columns]
+            ).where(
+                model.id.in_(last_entries_ids),
+                ~exists().where(
+                    latest_model.simulation_instance ==
+                    model.simulation_instance,
+                    latest_model.ue == model.ue
+                )
+            )
+
+            result = connection.execute(
+                insert(latest_model).from_select(columns, missing_entries)
+            )
+            if result.rowcount:
+                logging.info(
+                    f"Backfilled {result.rowcount} entries of the " +
+                    f"'{latest_model.__tablename__}' table."
+                )
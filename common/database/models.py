@@ -12,6 +12,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     Boolean,
+    Index,
     event
 )
 from common.database.database import Base
@@ -29,6 +30,12 @@ class Simulation(Base):
 
 class SimulationInstance(Base):
     __tablename__ = "simulation_instance"
+    __table_args__ = (
+        Index(
+            "ix_simulation_instance_root_simulation_id",
+            "root_simulation", "id"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     root_simulation = Column(
@@ -44,6 +51,17 @@ class SimulationInstance(Base):
 
 class ChildSimulationInstance(Base):
     __tablename__ = "child_simulation_instance"
+    __table_args__ = (
+        Index(
+            "ix_child_simulation_instance_simulation_instance",
+            "simulation_instance"
+        ),
+        Index(
+            "ix_child_simulation_instance_end_timestamp",
+            "end_timestamp"
+        ),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     simulation_instance = Column(
         Integer, ForeignKey("simulation_instance.id"), nullable=False
@@ -58,6 +76,12 @@ class ChildSimulationInstance(Base):
 
 class SimulationUE(Base):
     __tablename__ = "simulation_ue"
+    __table_args__ = (
+        Index(
+            "ix_simulation_ue_root_simulation_phone_number",
+            "root_simulation", "phone_number"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     root_simulation = Column(
@@ -73,6 +97,12 @@ class SimulationUE(Base):
 
 class SimulationUEInstance(Base):
     __tablename__ = "simulation_ue_instance"
+    __table_args__ = (
+        Index(
+            "ix_simulation_ue_instance_simulation_instance_ue",
+            "simulation_instance", "simulation_ue"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     simulation_instance = Column(
@@ -102,8 +132,34 @@ class DeviceLocationSimulationData(Base):
     timestamp = Column(DateTime(timezone=True))
 
 
+# The latest tables keep only the last simulation data entry of each
+# (simulation instance, UE). They are upserted alongside the history tables
+# and are the ones read by the APIs and by the events module
+class DeviceLocationLatest(Base):
+    __tablename__ = "device_location_latest"
+
+    simulation_instance = Column(
+        Integer, ForeignKey("simulation_instance.id"), primary_key=True
+    )
+    ue = Column(
+        Integer, ForeignKey("simulation_ue_instance.id"), primary_key=True
+    )
+    child_simulation_instance = Column(
+        Integer, ForeignKey("child_simulation_instance.id"), nullable=False
+    )
+    latitude = Column(Float)
+    longitude = Column(Float)
+    timestamp = Column(DateTime(timezone=True))
+
+
 class DeviceLocationSubscription(Base):
     __tablename__ = "device_location_subscription"
+    __table_args__ = (
+        Index(
+            "ix_device_location_subscription_root_simulation_expire_time",
+            "root_simulation", "expire_time"
+        ),
+    )
 
     id = Column(
         String, primary_key=True, index=True,
@@ -152,8 +208,30 @@ class SimSwapSimulationData(Base):
     timestamp = Column(DateTime(timezone=True))
 
 
+class SimSwapLatest(Base):
+    __tablename__ = "sim_swap_latest"
+
+    simulation_instance = Column(
+        Integer, ForeignKey("simulation_instance.id"), primary_key=True
+    )
+    ue = Column(
+        Integer, ForeignKey("simulation_ue_instance.id"), primary_key=True
+    )
+    child_simulation_instance = Column(
+        Integer, ForeignKey("child_simulation_instance.id"), nullable=False
+    )
+    new_msisdn = Column(String)
+    timestamp = Column(DateTime(timezone=True))
+
+
 class SimulationMecPlatform(Base):
     __tablename__ = "simulation_mec_platform"
+    __table_args__ = (
+        Index(
+            "ix_simulation_mec_platform_root_simulation",
+            "root_simulation"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     root_simulation = Column(
@@ -187,8 +265,34 @@ class DeviceStatusSimulationData(Base):
     timestamp = Column(DateTime(timezone=True), default=datetime.now)
 
 
+class DeviceStatusLatest(Base):
+    __tablename__ = "device_status_latest"
+
+    simulation_instance = Column(
+        Integer, ForeignKey("simulation_instance.id"), primary_key=True
+    )
+    ue = Column(
+        Integer, ForeignKey("simulation_ue_instance.id"), primary_key=True
+    )
+    child_simulation_instance = Column(
+        Integer, ForeignKey("child_simulation_instance.id"), nullable=False
+    )
+    connectivity_status = Column(String)
+    roaming = Column(Boolean)
+    country_code = Column(Integer)
+    # Will receive a list of strings parsed to json
+    country_name = Column(String)
+    timestamp = Column(DateTime(timezone=True), default=datetime.now)
+
+
 class DeviceStatusSubscription(Base):
     __tablename__ = "device_status_subscription"
+    __table_args__ = (
+        Index(
+            "ix_device_status_subscription_root_simulation_expire_time",
+            "root_simulation", "expire_time"
+        ),
+    )
 
     id = Column(
         String, primary_key=True, index=True,
@@ -218,6 +322,14 @@ class DeviceStatusSubscriptionNotification(Base):
     error = Column(String, nullable=True, default=None)
 
 
+# Latest table of each simulation data history table
+LATEST_TABLES = {
+    DeviceLocationSimulationData: DeviceLocationLatest,
+    SimSwapSimulationData: SimSwapLatest,
+    DeviceStatusSimulationData: DeviceStatusLatest,
+}
+
+
 @event.listens_for(DeviceLocationSubscription, 'before_insert')
 @event.listens_for(DeviceStatusSubscription, 'before_insert')
 def before_insert(mapper, connection, target):
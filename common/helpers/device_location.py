@@ -5,8 +5,8 @@
 # @Last Modified time: 2023-12-22 21:07:45
 
 import utm
-from datetime import datetime
-from pyproj import Proj
+from functools import lru_cache
+from pyproj import Proj, Transformer
 from fastapi.responses import JSONResponse
 import random
 import config # noqa
@@ -16,8 +16,6 @@ from common.apis.device_location_schemas import (
     Circle,
     Point,
     ErrorInfo,
-    VerifyLocationResponse,
-    VerificationResult,
     Device,
     DeviceIpv4Addr,
     Area,
@@ -27,6 +25,7 @@ from common.apis.device_location_schemas import (
     SubscriptionDetail
 )
 from common.database import models
+from common.simulation.clock import clock as SimulationClock
 import hashlib
 from shapely import geometry
 import json
@@ -93,7 +92,7 @@ def compute_simulated_data_age(
     device_location_data: models.DeviceLocationSimulationData
 ):
     # Get the current time
-    current_time = datetime.utcnow()
+    current_time = SimulationClock.utcnow()
 
     # Compute the time difference
     time_difference = current_time - device_location_data.timestamp
@@ -141,16 +140,43 @@ def get_utm_zone_from_coordinates(latitude: float, longitude: float) -> str:
     return utm.from_latlon(latitude, longitude)
 
 
+def get_utm_zone_number_from_coordinates(
+    latitude: float, longitude: float
+) -> int:
+    return utm.latlon_to_zone_number(latitude, longitude)
+
+
+@lru_cache(maxsize=None)
+def get_utm_transformer(zone_number: int) -> Transformer:
+    # Building a projection is much more expensive than using it, so there
+    # is a single transformer per UTM zone, which is reused by every point
+    projection = Proj(proj='utm', zone=zone_number, ellps='WGS84')
+    return Transformer.from_crs(
+        projection.crs.geodetic_crs,
+        projection.crs,
+        always_xy=True
+    )
+
+
+def project(latitudes, longitudes):
+    # Converts latitudes and longitudes to Cartesian coordinates, in a
+    # single vectorized call. All the points are projected in the UTM zone
+    # of the first one, so that the shapes they define are not distorted
+    zone_number = get_utm_zone_number_from_coordinates(
+        latitude=latitudes[0],
+        longitude=longitudes[0]
+    )
+    return get_utm_transformer(zone_number).transform(longitudes, latitudes)
+
+
 def get_shapely_point_from_coordinates(latitude: float, longitude: float):
     # Get the UTM Zone
-    _, _, zone_number, _ = get_utm_zone_from_coordinates(
+    zone_number = get_utm_zone_number_from_coordinates(
         latitude=latitude,
         longitude=longitude
     )
     # Convert latitude and longitude to Cartesian coordinates
-    project = Proj(proj='utm', zone=zone_number, ellps='WGS84')
-
-    return project(longitude, latitude)
+    return get_utm_transformer(zone_number).transform(longitude, latitude)
 
 
 def shapely_circle_from_coordinates_circle(
@@ -181,58 +207,12 @@ def shapely_circle_from_coordinates_circle_without_radius(
 
 
 def shapely_polygon_from_list_of_coordinates_points(coordinates_points):
-    return geometry.Polygon(
-        [
-            get_shapely_point_from_coordinates(
-                latitude=p.latitude,
-                longitude=p.longitude
-            )
-            for p
-            in coordinates_points
-        ]
+    # All the vertices are projected at once
+    xs, ys = project(
+        [p.latitude for p in coordinates_points],
+        [p.longitude for p in coordinates_points]
     )
-
-
-def compute_location_verification_result(
-    device: geometry.Polygon,
-    area: geometry.Polygon
-) -> VerifyLocationResponse:
-    datetime_formatter = "%Y-%m-%dT%H:%M:%S.%fZ"
-    # Verify if the device is fully contained in the area
-    if area.contains(device):
-        return VerifyLocationResponse(
-            last_location_time=datetime.min.strftime(datetime_formatter),
-            verification_result=VerificationResult.TRUE
-        )
-
-    # Verify if the device is partially contained in the area
-    overlap = device.intersection(area)
-    if overlap.area > 0:
-        return VerifyLocationResponse(
-            last_location_time=datetime.min.strftime(datetime_formatter),
-            verification_result=VerificationResult.PARTIAL,
-            matchRate=max(round(overlap.area/device.area*100), 1)
-        )
-
-    return VerifyLocationResponse(
-        last_location_time=datetime.min.strftime(datetime_formatter),
-        verification_result=VerificationResult.FALSE
-    )
-
-
-def shapely_polygon_from_area(area):
-    # Filter according to the area type
-    if area.area_type == "circle":
-        return shapely_circle_from_coordinates_circle(
-            center_latitude=area.center.latitude,
-            center_longitude=area.center.longitude,
-            radius_meters=area.radius
-        )
-    # else -> its a polygon
-    else:
-        return shapely_polygon_from_list_of_coordinates_points(
-            coordinates_points=area.boundary
-        )
+    return geometry.Polygon(list(zip(xs, ys)))
 
 
 def parse_simulation_ue_to_pydantic_device(
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 19:02:13
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 19:02:13
+import math
+from functools import cached_property
+import shapely
+from shapely import geometry
+import config # noqa
+from common.apis.device_location_schemas import VerificationResult
+from common.helpers import device_location as DeviceLocationHelper
+
+# Positions of an area relative to another one. The UE is considered to be
+# inside an area if it is fully or partially inside it
+INSIDE_RESULTS = (VerificationResult.TRUE, VerificationResult.PARTIAL)
+
+
+class CircleArea:
+    # Projected circle. Its relative position to other areas is computed in
+    # closed form, so it is only materialized as a polygon if its overlap
+    # with a polygon has to be measured
+
+    def __init__(self, x, y, radius):
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.bounds = (x - radius, y - radius, x + radius, y + radius)
+        self.area = math.pi * radius ** 2
+
+    @classmethod
+    def from_coordinates(cls, latitude, longitude, radius):
+        x, y = DeviceLocationHelper.get_shapely_point_from_coordinates(
+            latitude=latitude,
+            longitude=longitude
+        )
+        return cls(x, y, radius)
+
+    @cached_property
+    def polygon(self):
+        return geometry.Point(self.x, self.y).buffer(self.radius)
+
+    def locate(self, ue_area, with_match_rate=False):
+        distance = math.hypot(self.x - ue_area.x, self.y - ue_area.y)
+
+        if distance + ue_area.radius <= self.radius:
+            return VerificationResult.TRUE, None
+        if distance >= self.radius + ue_area.radius:
+            return VerificationResult.FALSE, None
+        if not with_match_rate:
+            return VerificationResult.PARTIAL, None
+
+        # Area of the lens where both circles overlap
+        r, R = ue_area.radius, self.radius
+        if distance + R <= r:
+            overlap = self.area
+        else:
+            overlap = (
+                r ** 2 * math.acos(
+                    (distance ** 2 + r ** 2 - R ** 2) / (2 * distance * r)
+                )
+                + R ** 2 * math.acos(
+                    (distance ** 2 + R ** 2 - r ** 2) / (2 * distance * R)
+                )
+                - 0.5 * math.sqrt(
+                    (-distance + r + R) * (distance + r - R)
+                    * (distance - r + R) * (distance + r + R)
+                )
+            )
+        return VerificationResult.PARTIAL, overlap / ue_area.area
+
+
+class PolygonArea:
+    # Projected polygon. A circle is inside it if its center is inside it
+    # and far enough from its boundary, and outside of it if its center is
+    # outside it and far enough from its boundary
+
+    def __init__(self, polygon):
+        self.polygon = polygon
+        self.boundary = polygon.boundary
+        self.bounds = polygon.bounds
+        shapely.prepare(self.polygon)
+
+    @classmethod
+    def from_coordinates(cls, coordinates_points):
+        return cls(
+            DeviceLocationHelper
+            .shapely_polygon_from_list_of_coordinates_points(
+                coordinates_points=coordinates_points
+            )
+        )
+
+    def locate(self, ue_area, with_match_rate=False):
+        center_inside = shapely.contains_xy(
+            self.polygon, ue_area.x, ue_area.y
+        )
+        distance = shapely.distance(
+            self.boundary, geometry.Point(ue_area.x, ue_area.y)
+        )
+
+        if distance >= ue_area.radius:
+            if center_inside:
+                return VerificationResult.TRUE, None
+            return VerificationResult.FALSE, None
+        if not with_match_rate:
+            return VerificationResult.PARTIAL, None
+
+        overlap = self.polygon.intersection(ue_area.polygon)
+        return VerificationResult.PARTIAL, \
+            overlap.area / ue_area.polygon.area
+
+
+def area_from_pydantic_area(area):
+    # Filter according to the area type
+    if area.area_type == "circle":
+        return CircleArea.from_coordinates(
+            latitude=area.center.latitude,
+            longitude=area.center.longitude,
+            radius=area.radius
+        )
+    # else -> its a polygon
+    else:
+        return PolygonArea.from_coordinates(
+            coordinates_points=area.boundary
+        )
+
+
+def ue_area_from_coordinates(latitude, longitude):
+    # The area of a UE is always a circle, with a pseudo-random radius
+    return CircleArea.from_coordinates(
+        latitude=latitude,
+        longitude=longitude,
+        radius=DeviceLocationHelper.generate_random_radius(
+            latitude=latitude,
+            longitude=longitude
+        )
+    )
+
+
+def locate(ue_area, area, with_match_rate=False):
+    # Position of the UE relative to the area, and, if requested and the UE
+    # is partially inside the area, the ratio of the UE area that is inside
+    # of it
+    return area.locate(ue_area, with_match_rate=with_match_rate)
+
+
+def match_rate_from_ratio(ratio):
+    # The match rate of a partial match is always between 1 and 99
+    return min(max(round(ratio * 100), 1), 99)
@@ -3,18 +3,18 @@
 # @Date:   2023-12-14 11:14:04
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2023-12-27 14:46:34
-from datetime import datetime
 from fastapi.responses import JSONResponse
 import config # noqa
 from common.apis.sim_swap_schemas import ErrorInfo
 from common.database import models
+from common.simulation.clock import clock as SimulationClock
 
 
 def compute_simulated_data_age(
     sim_swap_simulation_data: models.SimSwapSimulationData
 ):
     # Get the current time
-    current_time = datetime.utcnow()
+    current_time = SimulationClock.utcnow()
 
     # Compute the time difference
     time_difference = current_time - sim_swap_simulation_data.timestamp
@@ -29,3 +29,6 @@ if "pytest" not in sys.modules:
             consumer_channel,
             topic.value
         )
+
+    # Create the exchange through which the simulations' data is published
+    Aux.create_data_exchange_if_doesnt_exist(consumer_channel)
@@ -7,6 +7,35 @@
 import pika
 import logging
 from common.message_broker.topics import Topics
+from common.message_broker import constants as Constants
+from common.simulation.simulation_types import SimulationType
+
+# The device status data is published with the DEVICE_STATUS.<simulation
+# instance>.<UE instance> routing key
+DEVICE_STATUS_ROUTING_KEYS = f"{SimulationType.DEVICE_STATUS.value}.#"
+
+# Routing keys (i.e., simulation types) of the data exchange's messages
+# that are delivered to each queue. The device status data is sharded
+# between the handlers workers through its own exchange
+DATA_EXCHANGE_BINDINGS = {
+    Topics.SIMULATION_DATA: [
+        SimulationType.DEVICE_LOCATION.value,
+        SimulationType.SIM_SWAP.value
+    ],
+    Topics.EVENTS: [
+        SimulationType.DEVICE_LOCATION.value,
+        DEVICE_STATUS_ROUTING_KEYS
+    ]
+}
+
+
+def device_status_routing_key(simulation_instance_id, ue_instance):
+    return f"{SimulationType.DEVICE_STATUS.value}." + \
+        f"{simulation_instance_id}.{ue_instance}"
+
+
+def device_status_queue(shard):
+    return f"{Constants.DEVICE_STATUS_QUEUE}.{shard}"
 
 
 def create_queue_if_doesnt_exist(channel, queue_name):
@@ -39,3 +68,92 @@ def create_queue_if_doesnt_exist(channel, queue_name):
             f"Couldn't create the queue '{queue_name}'. Reason: {e}"
         )
         exit(1)
+
+
+def create_data_exchange_if_doesnt_exist(channel):
+    try:
+        channel.exchange_declare(
+            exchange=Constants.DATA_EXCHANGE,
+            exchange_type='topic'
+        )
+        logging.info(
+            f"The exchange '{Constants.DATA_EXCHANGE}' was created with " +
+            "the exchange type 'topic'."
+        )
+        for topic, routing_keys in DATA_EXCHANGE_BINDINGS.items():
+            for routing_key in routing_keys:
+                channel.queue_bind(
+                    exchange=Constants.DATA_EXCHANGE,
+                    queue=topic.value,
+                    routing_key=routing_key
+                )
+                logging.info(
+                    f"The queue '{topic.value}' was bound to the exchange " +
+                    f"'{Constants.DATA_EXCHANGE}' with the routing key " +
+                    f"'{routing_key}'."
+                )
+
+        # Requires RabbitMQ's rabbitmq_consistent_hash_exchange plugin
+        channel.exchange_declare(
+            exchange=Constants.DEVICE_STATUS_EXCHANGE,
+            exchange_type='x-consistent-hash'
+        )
+        channel.exchange_bind(
+            destination=Constants.DEVICE_STATUS_EXCHANGE,
+            source=Constants.DATA_EXCHANGE,
+            routing_key=DEVICE_STATUS_ROUTING_KEYS
+        )
+        logging.info(
+            f"The exchange '{Constants.DEVICE_STATUS_EXCHANGE}' was " +
+            "created with the exchange type 'x-consistent-hash'."
+        )
+
+    except pika.exceptions.ChannelClosedByBroker as e:
+        logging.error(
+            f"Couldn't create the exchange '{Constants.DATA_EXCHANGE}'. " +
+            f"Reason: {e}"
+        )
+        exit(1)
+
+
+def create_device_status_queue_if_doesnt_exist(channel, shard):
+    # Each shard queue receives an equal share of the UEs
+    queue = device_status_queue(shard)
+    channel.queue_declare(queue=queue)
+    channel.queue_bind(
+        exchange=Constants.DEVICE_STATUS_EXCHANGE,
+        queue=queue,
+        routing_key=Constants.DEVICE_STATUS_QUEUE_WEIGHT
+    )
+    logging.info(
+        f"The queue '{queue}' was bound to the exchange " +
+        f"'{Constants.DEVICE_STATUS_EXCHANGE}'."
+    )
+    return queue
+
+
+def retire_device_status_queues(channel, first_shard):
+    # A previous run, with more handlers workers, may have left shard queues
+    # from first_shard onwards. They are unbound, so that no more data is
+    # routed to them. Returns their shards, so that their remaining messages
+    # are still consumed. The channel is closed by the broker once a
+    # missing queue is found
+    shards = []
+    shard = first_shard
+    while True:
+        queue = device_status_queue(shard)
+        try:
+            channel.queue_declare(queue=queue, passive=True)
+        except pika.exceptions.ChannelClosedByBroker:
+            return shards
+        channel.queue_unbind(
+            queue=queue,
+            exchange=Constants.DEVICE_STATUS_EXCHANGE,
+            routing_key=Constants.DEVICE_STATUS_QUEUE_WEIGHT
+        )
+        logging.info(
+            f"The queue '{queue}' was unbound from the exchange " +
+            f"'{Constants.DEVICE_STATUS_EXCHANGE}'."
+        )
+        shards.append(shard)
+        shard += 1
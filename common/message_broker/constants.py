@@ -6,3 +6,27 @@
 
 PIKA_CONNECTION_HOST = "localhost"
 PIKA_CONNECTION_PORT = 5672
+
+# Number of connections (each with a single channel) kept by the
+# publishers pool, and how many times a failed publish is retried on a new
+# connection
+PUBLISHER_POOL_SIZE = 4
+PUBLISHER_MAX_RETRIES = 3
+
+# If True, the batches of UE positions are published with the compact
+# binary encoding. Otherwise, they are published as JSON
+BINARY_ENCODING = True
+
+# Topic exchange to which the simulations publish their data, once, with
+# the simulation type as routing key. Each queue is bound to the types of
+# simulation data it consumes
+DATA_EXCHANGE = "simulations_data_exchange"
+
+# Consistent hash exchange that shards the device status data between the
+# handlers workers. Each worker consumes its own DEVICE_STATUS_QUEUE.<shard>
+# queue, bound with DEVICE_STATUS_QUEUE_WEIGHT. As the routing key of the
+# device status data ends with its simulation instance and UE instance, the
+# data of each UE is always routed to the same worker, in order
+DEVICE_STATUS_EXCHANGE = "device_status_data_exchange"
+DEVICE_STATUS_QUEUE = "device_status_data"
+DEVICE_STATUS_QUEUE_WEIGHT = "1"
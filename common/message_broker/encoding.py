@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 15:12:09
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 15:12:09
+
+import json
+import struct
+from datetime import datetime, timedelta
+from . import constants as Constants
+from . import schemas as SimulationSchemas
+from common.simulation.simulation_types import SimulationType
+
+# The encoding of each message is set in its AMQP content_type property.
+# Messages without it are considered to be JSON
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_LOCATION_BATCH = "application/vnd.simulator.location-batch"
+
+# Binary layout of a batch of UE positions (little-endian)
+#  - header: simulation_id, simulation_instance_id, number of positions
+#  - position: child_simulation_instance_id, ue, ue_instance, latitude,
+#    longitude, timestamp (milliseconds since the Unix epoch, UTC)
+LOCATION_BATCH_HEADER = struct.Struct("<qqI")
+LOCATION_BATCH_POSITION = struct.Struct("<qqqddq")
+
+UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+def encode(simulation_data: SimulationSchemas.SimulationData):
+    # Returns the message's body and its content type
+    if (
+        Constants.BINARY_ENCODING
+        and
+        isinstance(
+            simulation_data.data,
+            SimulationSchemas.DeviceLocationBatchSimulationData
+        )
+    ):
+        return encode_location_batch(simulation_data), \
+            CONTENT_TYPE_LOCATION_BATCH
+
+    return simulation_data.model_dump_json(), CONTENT_TYPE_JSON
+
+
+def decode(body, properties=None):
+    # Returns the message as a dict, regardless of its encoding
+    content_type = properties.content_type if properties else None
+
+    if content_type == CONTENT_TYPE_LOCATION_BATCH:
+        return decode_location_batch(body)
+
+    return json.loads(body)
+
+
+def encode_location_batch(simulation_data: SimulationSchemas.SimulationData):
+    positions = simulation_data.data.positions
+    millisecond = timedelta(milliseconds=1)
+
+    values = []
+    for position in positions:
+        values += (
+            position.child_simulation_instance_id,
+            position.ue,
+            position.ue_instance,
+            position.latitude,
+            position.longitude,
+            (position.timestamp - UNIX_EPOCH) // millisecond
+        )
+
+    return LOCATION_BATCH_HEADER.pack(
+        simulation_data.simulation_id,
+        simulation_data.simulation_instance_id,
+        len(positions)
+    ) + struct.pack(
+        "<" + LOCATION_BATCH_POSITION.format[1:] * len(positions),
+        *values
+    )
+
+
+def decode_location_batch(body):
+    simulation_id, simulation_instance_id, _ = LOCATION_BATCH_HEADER\
+        .unpack_from(body, 0)
+
+    positions = [
+        {
+            "child_simulation_instance_id": child_simulation_instance_id,
+            "ue": ue,
+            "ue_instance": ue_instance,
+            "latitude": latitude,
+            "longitude": longitude,
+            "timestamp": UNIX_EPOCH + timedelta(milliseconds=timestamp)
+        }
+        for (
+            child_simulation_instance_id, ue, ue_instance, latitude,
+            longitude, timestamp
+        )
+        in LOCATION_BATCH_POSITION.iter_unpack(
+            memoryview(body)[LOCATION_BATCH_HEADER.size:]
+        )
+    ]
+
+    return {
+        "simulation_id": simulation_id,
+        "simulation_instance_id": simulation_instance_id,
+        "child_simulation_instance_id": -1,
+        "simulation_type": SimulationType.DEVICE_LOCATION.value,
+        "data": {"positions": positions},
+        "scope": "SIMULATION_DATA"
+    }
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 14:02:51
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 14:02:51
+
+import logging
+import queue
+import pika
+from . import constants as Constants
+from . import connections_factory as Factory
+
+
+class Publisher:
+    # A pika connection and its channel. The connection is only opened
+    # when it is first needed, and is reopened if it is lost
+
+    def __init__(self):
+        self.connection = None
+        self.channel = None
+
+    def publish(self, exchange, routing_key, body, properties=None):
+        if (
+            not self.connection or self.connection.is_closed
+            or
+            not self.channel or self.channel.is_closed
+        ):
+            self.close()
+            self.connection, self.channel = Factory\
+                .get_new_pika_connection_and_channel()
+
+        self.channel.basic_publish(
+            exchange=exchange,
+            routing_key=routing_key,
+            body=body,
+            properties=properties
+        )
+
+    def close(self):
+        try:
+            if self.connection and self.connection.is_open:
+                self.connection.close()
+        except Exception as e:
+            logging.warning(f"Could not close a publisher. Reason: {e}")
+        self.connection = None
+        self.channel = None
+
+
+class PublisherPool:
+    # Pika connections are not thread-safe. Thus, each publisher is handed
+    # to a single thread at a time, and threads wait for a free publisher
+    # when all of them are in use
+
+    def __init__(
+        self, size=Constants.PUBLISHER_POOL_SIZE,
+        max_retries=Constants.PUBLISHER_MAX_RETRIES
+    ):
+        self.max_retries = max_retries
+        self.publishers = queue.Queue()
+        for _ in range(size):
+            self.publishers.put(Publisher())
+
+    def publish(self, routing_key, body, exchange='', properties=None):
+        publisher = self.publishers.get()
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    publisher.publish(exchange, routing_key, body, properties)
+                    return
+                except (
+                    pika.exceptions.AMQPError, ConnectionError, OSError
+                ) as e:
+                    logging.warning(
+                        f"Could not publish to '{routing_key}' (attempt " +
+                        f"{attempt + 1}). Reason: {repr(e)}"
+                    )
+                    # Force a reconnection on the next attempt
+                    publisher.close()
+                    if attempt == self.max_retries:
+                        raise
+        finally:
+            self.publishers.put(publisher)
+
+    def close(self):
+        while not self.publishers.empty():
+            self.publishers.get().close()
+
+
+# Process-wide pool, shared by all producers
+publisher_pool = PublisherPool()
@@ -46,6 +46,36 @@ class SimulationData(BaseModel):
     scope: str = Field(default="SIMULATION_DATA")
 
 
+class DeviceLocationBatchEntry(DeviceLocationSimulationData):
+    child_simulation_instance_id: int
+    # UTC. Parsing a datetime is cheaper than parsing a formatted string
+    timestamp: datetime
+
+
+class DeviceLocationBatchSimulationData(BaseModel):
+    # Positions of many UEs, of the same simulation instance, advertised in
+    # a single message
+    positions: List[DeviceLocationBatchEntry]
+
+    def expand(self, simulation_data: SimulationData):
+        # Returns one SimulationData message per position
+        return [
+            SimulationData(
+                simulation_id=simulation_data.simulation_id,
+                simulation_instance_id=simulation_data.simulation_instance_id,
+                child_simulation_instance_id=position
+                .child_simulation_instance_id,
+                simulation_type=simulation_data.simulation_type,
+                data=position.model_dump(
+                    exclude={"child_simulation_instance_id"}
+                ),
+                scope=simulation_data.scope
+            )
+            for position
+            in self.positions
+        ]
+
+
 class Subscription(BaseModel):
     simulation_id: int
     subscription_id: str
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 13:05:44
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 13:05:44
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+import config # noqa
+from common.simulation import constants as Constants
+
+
+class SimulationClock:
+    # Shared notion of time of all the modules. It runs speed times faster
+    # than the wall clock. In the max speed mode, which is only enabled in
+    # the simulations module, time only moves forward when the simulations
+    # scheduler advances it to its next due event
+
+    def __init__(
+        self, speed=Constants.SIMULATION_CLOCK_SPEED, max_speed=False,
+        epoch=Constants.SIMULATION_CLOCK_EPOCH
+    ):
+        if speed <= 0:
+            raise ValueError("The simulation clock speed must be positive.")
+        # Otherwise, each process would use its own start time as epoch,
+        # and their clocks would not agree
+        if speed != 1 and not epoch:
+            raise ValueError(
+                "The simulation clock epoch must be set when its speed " +
+                "is not 1."
+            )
+
+        self.speed = speed
+        self.max_speed = max_speed
+        self.epoch = self._parse_epoch(epoch) if epoch else datetime.utcnow()
+        self.lock = threading.Lock()
+        # Simulated seconds since the epoch. Only used in the max speed mode
+        self.elapsed = self._wall_clock_elapsed_seconds()
+
+    def _parse_epoch(self, epoch):
+        epoch = datetime.fromisoformat(epoch)
+        if epoch.tzinfo:
+            epoch = epoch.astimezone(timezone.utc).replace(tzinfo=None)
+        return epoch
+
+    def enable_max_speed(self):
+        # Only the simulations module, whose scheduler advances the clock,
+        # may run at max speed. Time starts from the speed time
+        with self.lock:
+            self.elapsed = self._wall_clock_elapsed_seconds()
+            self.max_speed = True
+
+    def _wall_clock_elapsed_seconds(self):
+        return (datetime.utcnow() - self.epoch).total_seconds() * self.speed
+
+    def utcnow(self):
+        if self.max_speed:
+            with self.lock:
+                return self.epoch + timedelta(seconds=self.elapsed)
+        if self.speed == 1:
+            return datetime.utcnow()
+        return self.epoch + timedelta(
+            seconds=self._wall_clock_elapsed_seconds()
+        )
+
+    def monotonic(self):
+        # Simulated seconds, only meaningful when compared with each other
+        if self.max_speed:
+            with self.lock:
+                return self.elapsed
+        return time.monotonic() * self.speed
+
+    def real_delay(self, delay):
+        # Wall clock seconds that correspond to a simulated delay
+        if self.max_speed:
+            return 0
+        return delay / self.speed
+
+    def advance_to(self, monotonic_time):
+        # Only used in the max speed mode. Time never moves backwards
+        if not self.max_speed:
+            return
+        with self.lock:
+            self.elapsed = max(self.elapsed, monotonic_time)
+
+
+# Process-wide clock, read by all the modules
+clock = SimulationClock()
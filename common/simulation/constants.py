@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 13:05:44
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 13:05:44
+import os
+
+# The simulation clock may run faster than the wall clock. All the modules
+# (simulations, handlers, events and APIs) must share the same settings
+# for their clocks to agree. They may be set through the environment
+#  - SIMULATION_CLOCK_SPEED: how many simulated seconds pass per second
+#  - SIMULATION_CLOCK_MAX_SPEED: if "true", the simulations scheduler jumps
+#    straight to the next due event instead of waiting for it. Only the
+#    simulations module runs at max speed. The other modules keep following
+#    the clock speed
+#  - SIMULATION_CLOCK_EPOCH: ISO 8601 UTC instant at which the simulated
+#    and the wall clock match. It must be set when the clock speed is not
+#    1. Otherwise, the process' start time is used
+SIMULATION_CLOCK_SPEED = float(os.environ.get("SIMULATION_CLOCK_SPEED", 1))
+SIMULATION_CLOCK_MAX_SPEED = os.environ.get(
+    "SIMULATION_CLOCK_MAX_SPEED", "false"
+).lower() == "true"
+SIMULATION_CLOCK_EPOCH = os.environ.get("SIMULATION_CLOCK_EPOCH")
@@ -13,9 +13,10 @@ from common.apis.device_status_schemas import (
     ConnectivityStatus,
     Webhook
 )
-from datetime import datetime, timedelta
+from datetime import timedelta
 import json
 from common.database import crud
+from common.simulation.clock import clock as SimulationClock
 
 
 class DeviceStatusSubscriptionsManager(SubscriptionsManager):
@@ -27,29 +28,22 @@ class DeviceStatusSubscriptionsManager(SubscriptionsManager):
 
         # CLEANUP
         if "stop" in simulation_data.data:
-            i = len(self.active_subscriptions) - 1
-            while i >= 0:
-                if self.active_subscriptions[i].simulation_id == \
-                        simulation_data.simulation_id:
-                    logging.info(
-                        "Will delete Simulation: " +
-                        f"({self.active_subscriptions[i]})."
-                    )
-                    del self.active_subscriptions[i]
-
-                i -= 1
+            self.remove_simulation_subscriptions(simulation_data.simulation_id)
             return
 
-        for subscription in self.get_subscriptions(
+        # Only consider the subscriptions that relate with the current UE
+        ue_subscriptions = self.get_subscriptions(
             simulation_data.simulation_id
-        ):
-            # Only consider the simulations that relate with the current UE
+        ).get(simulation_data.data["ue"], {})
+        current_time = SimulationClock.utcnow()
+
+        for subscription in [
+            subscription
+            for event_type_subscriptions in ue_subscriptions.values()
+            for subscription in event_type_subscriptions
+        ]:
             # Only considered not expired subscriptions
-            if (
-                simulation_data.data["ue"] != subscription.ue
-                or
-                datetime.utcnow() > subscription.expire_time
-            ):
+            if current_time > subscription.expire_time:
                 continue  # SKIP
 
             if subscription.device_status_subscription_type in [
@@ -83,7 +77,7 @@ class DeviceStatusSubscriptionsManager(SubscriptionsManager):
 
             # Finally, update the subscription data
             self.update_subscription(simulation_data, subscription)
-            
+
     def update_subscription(
         self, simulation_data: SimulationData,
         subscription: DeviceStatusSubscription,
@@ -181,6 +175,9 @@ class DeviceStatusSubscriptionsManager(SubscriptionsManager):
                     subscription=subscription
                 )
 
+    def get_subscription_event_type(self, subscription):
+        return subscription.device_status_subscription_type
+
     def map_subscription_to_connectivity_status(
         self, subs_event_type: SubscriptionEventType
     ):
@@ -197,7 +194,7 @@ class DeviceStatusSubscriptionsManager(SubscriptionsManager):
             not self.has_looked_for_subscriptions
             or
             self.last_subscriptions_update_timestamp + timedelta(seconds=5) <
-                datetime.utcnow()
+                SimulationClock.utcnow()
         ):
             self.has_looked_for_subscriptions = True
 
@@ -207,7 +204,7 @@ class DeviceStatusSubscriptionsManager(SubscriptionsManager):
             )
 
             # Update the last subscriptions update timestamp
-            self.last_subscriptions_update_timestamp = datetime.utcnow()
+            self.last_subscriptions_update_timestamp = SimulationClock.utcnow()
 
             # Store the current active subscriptions
             current_active_subscriptions = []
@@ -263,19 +260,11 @@ class DeviceStatusSubscriptionsManager(SubscriptionsManager):
                     )
                 )
 
-            # Check if the simulation is already loaded or not
-            loaded_subscriptions_ids = [
-                sub.subscription_id
-                for sub
-                in self.active_subscriptions
-            ]
-
             for current_active_subscription in current_active_subscriptions:
                 # Add a new subscription
-                if current_active_subscription.subscription_id not in \
-                        loaded_subscriptions_ids:
-                    self.active_subscriptions.append(
-                        current_active_subscription
-                    )
+                if not self.is_subscription_loaded(
+                    current_active_subscription
+                ):
+                    self.add_subscription(current_active_subscription)
 
-            return self.active_subscriptions
+        return self.active_subscriptions.get(root_simulation_id, {})
@@ -4,11 +4,11 @@
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2024-01-11 11:56:19
 import sys
-import json
 import logging
 import config # noqa
 from common.message_broker import connections_factory as PikaFactory
 from common.message_broker.topics import Topics
+from common.message_broker import encoding as Encoding
 from common.message_broker import schemas as MessageBrokerSchemas
 from geofencing_subscriptions_manager import GeofencingSubscriptionsManager
 from device_status_subscriptions_manager import (
@@ -27,7 +27,7 @@ def main():
 
     def events_callback(ch, method, properties, body):
 
-        message = json.loads(body)
+        message = Encoding.decode(body, properties)
         logging.debug(f"[x] Received {message}")
 
         # If the received payload relates with simulation data
@@ -37,9 +37,13 @@ def main():
 
             if simulation_data.simulation_type == SimulationType\
                     .DEVICE_LOCATION:
-                geofencing_subscriptions_manager.handle_ue_location_message(
-                    simulation_data
-                )
+                # The UEs' positions may be received in batches
+                if "positions" in simulation_data.data:
+                    geofencing_subscriptions_manager\
+                        .handle_ue_location_batch_message(simulation_data)
+                else:
+                    geofencing_subscriptions_manager\
+                        .handle_ue_location_message(simulation_data)
 
             elif simulation_data.simulation_type == SimulationType\
                     .DEVICE_STATUS:
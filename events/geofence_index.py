@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 17:48:36
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 18:10:52
+import config # noqa
+from shapely import STRtree, box
+from common.helpers import geometry_engine as GeometryEngine
+
+
+class Geofence:
+    # Projected area of a subscription. The area of a subscription never
+    # changes, so it is only projected once
+
+    def __init__(self, area):
+        self.area = GeometryEngine.area_from_pydantic_area(area=area)
+        self.bounds = self.area.bounds
+
+    def contains_or_overlaps(self, ue_area):
+        # Same criteria as the location verification: the UE is inside the
+        # geofence if its area is fully or partially inside the geofence
+        verification_result, _ = GeometryEngine.locate(
+            ue_area=ue_area,
+            area=self.area
+        )
+        return verification_result in GeometryEngine.INSIDE_RESULTS
+
+
+class GeofenceIndex:
+    # R-tree (STRtree) over the geofences of the subscriptions of a UE. Each
+    # UE position only has to be tested against the geofences whose
+    # bounding box it intersects
+
+    def __init__(self, subscriptions, geofences):
+        self.subscriptions = subscriptions
+        self.geofences = geofences
+        self.tree = STRtree([box(*geofence.bounds) for geofence in geofences])
+        # Subscriptions in which the UE is not known to be outside of the
+        # geofence. The remaining ones need no update while the UE stays
+        # away from their geofence
+        self.not_outside = {
+            i
+            for i, subscription in enumerate(subscriptions)
+            if subscription.ue_inside_geofence is not False
+        }
+
+    def query(self, ue_area):
+        # Indexes of the subscriptions whose geofence may intersect the UE
+        return set(self.tree.query(box(*ue_area.bounds)).tolist())
+
+    def update(self, i):
+        if self.subscriptions[i].ue_inside_geofence is False:
+            self.not_outside.discard(i)
+        else:
+            self.not_outside.add(i)
@@ -5,88 +5,161 @@
 # @Last Modified time: 2024-01-11 14:29:14
 import config # noqa
 import logging
-from common.message_broker.schemas import SimulationData, SubscriptionType
+from common.message_broker.schemas import (
+    SimulationData,
+    SubscriptionType,
+    DeviceLocationBatchSimulationData
+)
 from common.subscriptions.schemas import GeofencingSubscription
 from subscriptions_manager import SubscriptionsManager
+from geofence_index import Geofence, GeofenceIndex
 from common.apis.device_location_schemas import (
     SubscriptionEventType,
-    VerificationResult,
     Webhook
 )
 from common.helpers import device_location as DeviceLocationHelper
-from datetime import datetime, timedelta
+from common.helpers import geometry_engine as GeometryEngine
+from datetime import timedelta
 import json
 from common.database import crud
+from common.simulation.clock import clock as SimulationClock
 
 
 class GeofencingSubscriptionsManager(SubscriptionsManager):
 
     def __init__(self):
         super().__init__()
+        # Geofence of each subscription, by simulation id and subscription id
+        self.geofences = {}
+        # Geofence index of each UE, by simulation id and UE. They are built
+        # from the UE's active subscriptions and rebuilt whenever these change
+        self.geofence_indexes = {}
 
     def handle_ue_location_message(self, simulation_data: SimulationData):
 
         # CLEANUP
         if "stop" in simulation_data.data:
-            i = len(self.active_subscriptions) - 1
-            while i >= 0:
-                if self.active_subscriptions[i].simulation_id == \
-                        simulation_data.simulation_id:
-                    logging.info(
-                        "Will delete Simulation: " +
-                        f"({self.active_subscriptions[i]})."
-                    )
-                    del self.active_subscriptions[i]
-
-                i -= 1
+            self.remove_simulation_subscriptions(simulation_data.simulation_id)
             return
 
-        for subscription in self.get_subscriptions(
+        # Only consider the subscriptions that relate with the current UE
+        ue_subscriptions = self.get_subscriptions(
             simulation_data.simulation_id
-        ):
+        ).get(simulation_data.data["ue"])
+        if not ue_subscriptions:
+            return
+
+        geofence_index = self.get_geofence_index(
+            simulation_data.simulation_id,
+            simulation_data.data["ue"],
+            ue_subscriptions
+        )
+
+        # Get UE Position Circle. It is computed once and then located
+        # relative to each geofence
+        ue_area = GeometryEngine.ue_area_from_coordinates(
+            latitude=simulation_data.data["latitude"],
+            longitude=simulation_data.data["longitude"]
+        )
+
+        # The UE can only be inside the geofences returned by the index.
+        # The other ones are only evaluated if the UE was not already known
+        # to be outside of them
+        candidates = geofence_index.query(ue_area)
+        current_time = SimulationClock.utcnow()
+
+        for i in sorted(candidates | geofence_index.not_outside):
+            subscription = geofence_index.subscriptions[i]
 
-            # Only consider the simulations that relate with the current UE
             # Only considered not expired subscriptions
-            if (
-                simulation_data.data["ue"] != subscription.ue
-                or
-                datetime.utcnow() > subscription.expire_time
-            ):
+            if current_time > subscription.expire_time:
                 continue  # SKIP
 
+            ue_inside_geofence = i in candidates and \
+                self.is_ue_inside_geofence(
+                    ue_area=ue_area,
+                    geofence=geofence_index.geofences[i]
+                )
+
             if subscription.geofencing_subscription_type == \
                     SubscriptionEventType.AREA_ENTERED:
-                self.has_ue_entered_geofence(simulation_data, subscription)
+                self.has_ue_entered_geofence(
+                    simulation_data, subscription, ue_inside_geofence
+                )
             elif subscription.geofencing_subscription_type == \
                     SubscriptionEventType.AREA_LEFT:
-                self.has_ue_left_geofence(simulation_data, subscription)
+                self.has_ue_left_geofence(
+                    simulation_data, subscription, ue_inside_geofence
+                )
             elif subscription.geofencing_subscription_type == \
                     SubscriptionEventType.SUBSCRIPTION_ENDS:
                 # TODO: Implement Later
                 pass
 
-    def has_ue_entered_geofence(
-        self, simulation_data: SimulationData,
-        subscription: GeofencingSubscription
+            geofence_index.update(i)
+
+    def handle_ue_location_batch_message(
+        self, simulation_data: SimulationData
     ):
-        # Get UE Position Circle and the subscription desirable area
-        ue_area, subscription_desired_area = \
-            self.parse_ue_and_subscription_area_to_shapely_polygons(
-                simulation_data=simulation_data,
-                subscription=subscription
-            )
+        batch = DeviceLocationBatchSimulationData(**simulation_data.data)
+        for position_simulation_data in batch.expand(simulation_data):
+            self.handle_ue_location_message(position_simulation_data)
 
+    def is_ue_inside_geofence(self, ue_area, geofence):
         # We consider that a UE entered a given are if it is fully inside that
         # area of partially inside it
-        ue_inside_geofence = DeviceLocationHelper\
-            .compute_location_verification_result(
-                device=ue_area,
-                area=subscription_desired_area
-            ).verification_result in [
-                VerificationResult.TRUE,
-                VerificationResult.PARTIAL
+        return geofence.contains_or_overlaps(ue_area)
+
+    def get_subscription_event_type(self, subscription):
+        return subscription.geofencing_subscription_type
+
+    def add_subscription(self, subscription):
+        super().add_subscription(subscription)
+        # The UE's geofence index is rebuilt when it is next needed
+        self.geofence_indexes.get(subscription.simulation_id, {}).pop(
+            subscription.ue, None
+        )
+
+    def remove_simulation_subscriptions(self, simulation_id):
+        super().remove_simulation_subscriptions(simulation_id)
+        self.geofences.pop(simulation_id, None)
+        self.geofence_indexes.pop(simulation_id, None)
+
+    def get_geofence(self, subscription: GeofencingSubscription):
+        simulation_geofences = self.geofences.setdefault(
+            subscription.simulation_id, {}
+        )
+        geofence = simulation_geofences.get(subscription.subscription_id)
+        if not geofence:
+            geofence = Geofence(subscription.area)
+            simulation_geofences[subscription.subscription_id] = geofence
+        return geofence
+
+    def get_geofence_index(self, simulation_id, ue, ue_subscriptions):
+        simulation_geofence_indexes = self.geofence_indexes.setdefault(
+            simulation_id, {}
+        )
+        geofence_index = simulation_geofence_indexes.get(ue)
+        if not geofence_index:
+            subscriptions = [
+                subscription
+                for event_type_subscriptions in ue_subscriptions.values()
+                for subscription in event_type_subscriptions
             ]
+            geofence_index = GeofenceIndex(
+                subscriptions,
+                [
+                    self.get_geofence(subscription)
+                    for subscription in subscriptions
+                ]
+            )
+            simulation_geofence_indexes[ue] = geofence_index
+        return geofence_index
 
+    def has_ue_entered_geofence(
+        self, simulation_data: SimulationData,
+        subscription: GeofencingSubscription, ue_inside_geofence: bool
+    ):
         if ue_inside_geofence:
             logging.info(
                 f"UE {simulation_data.data['ue']} is INside the are defined " +
@@ -99,25 +172,8 @@ class GeofencingSubscriptionsManager(SubscriptionsManager):
 
     def has_ue_left_geofence(
         self, simulation_data: SimulationData,
-        subscription: GeofencingSubscription
+        subscription: GeofencingSubscription, ue_inside_geofence: bool
     ):
-        # Get UE Position Circle and the subscription desirable area
-        ue_area, subscription_desired_area = \
-            self.parse_ue_and_subscription_area_to_shapely_polygons(
-                simulation_data=simulation_data,
-                subscription=subscription
-            )
-        # We consider that a UE entered a given are if it is fully inside that
-        # area of partially inside it
-        ue_inside_geofence = DeviceLocationHelper\
-            .compute_location_verification_result(
-                device=ue_area,
-                area=subscription_desired_area
-            ).verification_result in [
-                VerificationResult.TRUE,
-                VerificationResult.PARTIAL
-            ]
-
         if not ue_inside_geofence:
             logging.info(
                 f"UE {simulation_data.data['ue']} is OUTside the are " +
@@ -149,32 +205,13 @@ class GeofencingSubscriptionsManager(SubscriptionsManager):
                 subscription
             )
 
-    def parse_ue_and_subscription_area_to_shapely_polygons(
-        self, simulation_data: SimulationData,
-        subscription: GeofencingSubscription
-    ):
-        # Get UE Position Circle
-        ue_area = DeviceLocationHelper\
-            .shapely_circle_from_coordinates_circle_without_radius(
-                center_latitude=simulation_data.data["latitude"],
-                center_longitude=simulation_data.data["longitude"]
-            )
-
-        # Get the subscription desirable area
-        subscription_desired_area = DeviceLocationHelper\
-            .shapely_polygon_from_area(
-                area=subscription.area
-            )
-
-        return ue_area, subscription_desired_area
-
     def get_subscriptions(self, root_simulation_id):
 
         if (
             not self.has_looked_for_subscriptions
             or
             self.last_subscriptions_update_timestamp + timedelta(seconds=5) <
-                datetime.utcnow()
+                SimulationClock.utcnow()
         ):
             self.has_looked_for_subscriptions = True
 
@@ -184,7 +221,7 @@ class GeofencingSubscriptionsManager(SubscriptionsManager):
             )
 
             # Update the last subscriptions update timestamp
-            self.last_subscriptions_update_timestamp = datetime.utcnow()
+            self.last_subscriptions_update_timestamp = SimulationClock.utcnow()
 
             current_active_subscriptions = [
                 GeofencingSubscription(
@@ -211,19 +248,13 @@ class GeofencingSubscriptionsManager(SubscriptionsManager):
                 )
             ]
 
-            # Check if the simulation is already loaded or not
-            loaded_subscriptions_ids = [
-                sub.subscription_id
-                for sub
-                in self.active_subscriptions
-            ]
-
             for current_active_subscription in current_active_subscriptions:
                 # Add a new subscription
-                if current_active_subscription.subscription_id not in \
-                        loaded_subscriptions_ids:
-                    self.active_subscriptions.append(
-                        current_active_subscription
-                    )
+                if not self.is_subscription_loaded(
+                    current_active_subscription
+                ):
+                    self.add_subscription(current_active_subscription)
+                    # The subscription's area is projected only once
+                    self.get_geofence(current_active_subscription)
 
-        return self.active_subscriptions
+        return self.active_subscriptions.get(root_simulation_id, {})
@@ -12,9 +12,9 @@ import common.apis.device_location_schemas as DeviceLocationSchemas
 import common.apis.device_status_schemas as DeviceStatusSchemas
 
 import constants as Constants
-from datetime import datetime
 from common.database import crud
 from common.helpers import device_location as DeviceLocationHelpers
+from common.simulation.clock import clock as SimulationClock
 
 
 class Notifications:
@@ -108,7 +108,7 @@ class Notifications:
             type=subscription.geofencing_subscription_type,
             specversion="1.0",
             datacontenttype="application/json",
-            time=datetime.utcnow(),
+            time=SimulationClock.utcnow(),
             data={
                 "subscriptionId": subscription.subscription_id,
                 "device": pydantic_device.model_dump(),
@@ -209,7 +209,7 @@ class Notifications:
             type=subscription.device_status_subscription_type,
             specversion="1.0",
             datacontenttype="application/json",
-            time=datetime.utcnow(),
+            time=SimulationClock.utcnow(),
             data={
                 "device": {"phoneNumber": simulation_device.phone_number},
                 "subscriptionId": subscription.subscription_id,
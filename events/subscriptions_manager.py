@@ -2,17 +2,22 @@
 # @Author: Rafael Direito
 # @Date:   2023-12-19 15:22:15
 # @Last Modified by:   Rafael Direito
-# @Last Modified time: 2023-12-23 21:43:03
+# @Last Modified time: 2026-10-18 19:31:40
+import logging
 from common.database import connections_factory as DBFactory
+from common.simulation.clock import clock as SimulationClock
 from notifications import Notifications
-from datetime import datetime
 
 
 class SubscriptionsManager:
 
     def __init__(self):
-        self.last_subscriptions_update_timestamp = datetime.utcnow()
-        self.active_subscriptions = []
+        self.last_subscriptions_update_timestamp = SimulationClock.utcnow()
+        # Active subscriptions, indexed by simulation id, UE and event type:
+        # {simulation_id: {ue: {event_type: [subscriptions]}}}
+        self.active_subscriptions = {}
+        # Ids of the loaded subscriptions, by simulation id
+        self.loaded_subscriptions_ids = {}
         self.has_looked_for_subscriptions = False
         self.db = DBFactory.new_db_session()
         self.notifications = Notifications(
@@ -20,5 +25,31 @@ class SubscriptionsManager:
         )
 
     def get_subscriptions(self, root_simulation_id):
+        # Should be implemented in the child classes. Returns the active
+        # subscriptions of the simulation, by UE and event type
+        pass
+
+    def get_subscription_event_type(self, subscription):
         # Should be implemented in the child classes
         pass
+
+    def is_subscription_loaded(self, subscription) -> bool:
+        return subscription.subscription_id in \
+            self.loaded_subscriptions_ids.get(subscription.simulation_id, ())
+
+    def add_subscription(self, subscription):
+        self.loaded_subscriptions_ids.setdefault(
+            subscription.simulation_id, set()
+        ).add(subscription.subscription_id)
+        self.active_subscriptions\
+            .setdefault(subscription.simulation_id, {})\
+            .setdefault(subscription.ue, {})\
+            .setdefault(self.get_subscription_event_type(subscription), [])\
+            .append(subscription)
+
+    def remove_simulation_subscriptions(self, simulation_id):
+        logging.info(
+            f"Will delete the subscriptions of Simulation {simulation_id}."
+        )
+        self.loaded_subscriptions_ids.pop(simulation_id, None)
+        self.active_subscriptions.pop(simulation_id, None)
@@ -387,11 +387,18 @@ def get_simulated_data():
 def test_notification_method_is_being_called(
     subscriptions, expected_call_count, mocker
 ):
+    # Create DeviceStatusSubscriptionsManager and get simulation data
+    device_status_subs_manager = DeviceStatusSubscriptionsManager()
+    simulated_data = get_simulated_data()
+
+    for subscription in subscriptions:
+        device_status_subs_manager.add_subscription(subscription)
+
     # Prepare Mocks
     get_subscriptions_mock = mocker.patch(
         target="device_status_subscriptions_manager." +
         "DeviceStatusSubscriptionsManager.get_subscriptions",
-        return_value=subscriptions
+        return_value=device_status_subs_manager.active_subscriptions[1]
     )
 
     notifications_mock = mocker.patch(
@@ -400,10 +407,6 @@ def test_notification_method_is_being_called(
         return_value=True
     )
 
-    # Create DeviceStatusSubscriptionsManager and get simulation data
-    device_status_subs_manager = DeviceStatusSubscriptionsManager()
-    simulated_data = get_simulated_data()
-
     # Simualte that UE device status simulation data is arriving
     for simulation_data in simulated_data:
         device_status_subs_manager.handle_ue_status_message(
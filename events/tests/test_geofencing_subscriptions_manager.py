@@ -13,7 +13,9 @@ from common.simulation.simulation_types import SimulationType
 from notifications import Notifications
 from common.message_broker.schemas import (
     SimulationData,
-    DeviceLocationSimulationData
+    DeviceLocationSimulationData,
+    DeviceLocationBatchEntry,
+    DeviceLocationBatchSimulationData
 )
 from common.subscriptions.schemas import GeofencingSubscription
 import constants as Constants
@@ -181,13 +183,13 @@ def test_if_area_related_events_are_being_triggered(mocker):
     # Create Geofencing Subscriptions Manager
     geo_subs_manager = GeofencingSubscriptionsManager()
 
+    geo_subs_manager.add_subscription(area_entered_geofencing_subscription)
+    geo_subs_manager.add_subscription(area_left_geofencing_subscription)
+
     get_subscriptions_mock = mocker.patch(
         target="geofencing_subscriptions_manager." +
         "GeofencingSubscriptionsManager.get_subscriptions",
-        return_value=[
-            area_entered_geofencing_subscription,
-            area_left_geofencing_subscription
-        ]
+        return_value=geo_subs_manager.active_subscriptions[1]
     )
 
     # Simualte that UE device location simulation data is arriving
@@ -215,6 +217,147 @@ def test_if_area_related_events_are_being_triggered(mocker):
     )
 
 
+def test_if_area_related_events_are_being_triggered_by_batches(mocker):
+    area_entered_geofencing_subscription = GeofencingSubscription(
+        subscription_id="1",
+        subscription_type=SubscriptionType.DEVICE_LOCATION_GEOFENCING,
+        simulation_id=1,
+        area=Circle(
+            center=Point(
+                latitude=32.74513588903821,
+                longitude=-17.0078912128889
+            ),
+            radius=22.84*1000
+        ),
+        geofencing_subscription_type=SubscriptionEventType.AREA_ENTERED,
+        ue=1,
+        webhook=Webhook(
+            notification_url='https://webhook.site/44623dab-5634-46cc-a5ff-' +
+            'd9f1828057e8',
+            notification_auth_token='c8974e592c2fa383d4a3960714'
+        ),
+        expire_time=datetime.utcnow() + timedelta(minutes=2),
+    )
+
+    # All the UE positions are received in a single batch message
+    simulated_data = get_simulated_data()
+    batch_simulation_data = SimulationData(
+        simulation_id=1,
+        simulation_instance_id=1,
+        child_simulation_instance_id=-1,
+        simulation_type=SimulationType.DEVICE_LOCATION,
+        data=DeviceLocationBatchSimulationData(
+            positions=[
+                DeviceLocationBatchEntry(
+                    child_simulation_instance_id=simulation_data
+                    .child_simulation_instance_id,
+                    **simulation_data.data
+                )
+                for simulation_data
+                in simulated_data
+            ]
+        ).model_dump()
+    )
+
+    # Expected notifications
+    # Only the area-entered subscription is active. Thus, the UE entering
+    # the area at positions 2 and 4 triggers 2 area-entered notifications
+
+    # Set mocks
+    notifications_mock = mocker.patch(
+        target="notifications.Notifications.send_and_record_location_" +
+        "notification",
+        return_value=True
+    )
+
+    # Create Geofencing Subscriptions Manager
+    geo_subs_manager = GeofencingSubscriptionsManager()
+
+    geo_subs_manager.add_subscription(area_entered_geofencing_subscription)
+
+    get_subscriptions_mock = mocker.patch(
+        target="geofencing_subscriptions_manager." +
+        "GeofencingSubscriptionsManager.get_subscriptions",
+        return_value=geo_subs_manager.active_subscriptions[1]
+    )
+
+    geo_subs_manager.handle_ue_location_batch_message(
+        simulation_data=batch_simulation_data
+    )
+
+    # The batch is processed as if each position was received on its own
+    assert notifications_mock.call_count == 2
+    assert get_subscriptions_mock.call_count == len(simulated_data)
+
+
+def test_if_only_nearby_geofences_are_evaluated(mocker):
+    def area_entered_subscription(subscription_id, latitude, longitude):
+        return GeofencingSubscription(
+            subscription_id=subscription_id,
+            subscription_type=SubscriptionType.DEVICE_LOCATION_GEOFENCING,
+            simulation_id=1,
+            area=Circle(
+                center=Point(latitude=latitude, longitude=longitude),
+                radius=22.84*1000
+            ),
+            geofencing_subscription_type=SubscriptionEventType.AREA_ENTERED,
+            ue=1,
+            webhook=Webhook(
+                notification_url='https://webhook.site/44623dab-5634-' +
+                '46cc-a5ff-d9f1828057e8',
+                notification_auth_token='c8974e592c2fa383d4a3960714'
+            ),
+            expire_time=datetime.utcnow() + timedelta(minutes=2),
+        )
+
+    # One geofence around the UE's itinerary and many far away ones
+    subscriptions = [
+        area_entered_subscription(
+            "1", 32.74513588903821, -17.0078912128889
+        )
+    ] + [
+        area_entered_subscription(f"{i + 2}", 38 + i * 0.5, -9)
+        for i in range(50)
+    ]
+
+    simulated_data = get_simulated_data()
+
+    # Set mocks
+    notifications_mock = mocker.patch(
+        target="notifications.Notifications.send_and_record_location_" +
+        "notification",
+        return_value=True
+    )
+
+    # Create Geofencing Subscriptions Manager
+    geo_subs_manager = GeofencingSubscriptionsManager()
+
+    for subscription in subscriptions:
+        geo_subs_manager.add_subscription(subscription)
+
+    mocker.patch(
+        target="geofencing_subscriptions_manager." +
+        "GeofencingSubscriptionsManager.get_subscriptions",
+        return_value=geo_subs_manager.active_subscriptions[1]
+    )
+    is_ue_inside_geofence_spy = mocker.spy(
+        geo_subs_manager, "is_ue_inside_geofence"
+    )
+
+    for simulation_data in simulated_data:
+        geo_subs_manager.handle_ue_location_message(
+            simulation_data=simulation_data
+        )
+
+    # The UE enters the nearby geofence twice
+    assert notifications_mock.call_count == 2
+    notifications_mock.assert_has_calls(
+        [call(subscriptions[0]), call(subscriptions[0])]
+    )
+    # The far away geofences are never tested against the UE's positions
+    assert is_ue_inside_geofence_spy.call_count <= len(simulated_data)
+
+
 @pytest.mark.parametrize(
     'subscription, expected_return',
     [
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 21:19:37
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 21:19:37
+import pytest
+from types import SimpleNamespace
+from datetime import datetime
+import config # noqa
+from common.message_broker import encoding as Encoding
+from common.simulation.simulation_types import SimulationType
+from common.message_broker.schemas import (
+    SimulationData,
+    DeviceLocationSimulationData,
+    DeviceLocationBatchEntry,
+    DeviceLocationBatchSimulationData
+)
+
+
+def location_batch():
+    return SimulationData(
+        simulation_id=1,
+        simulation_instance_id=2,
+        child_simulation_instance_id=-1,
+        simulation_type=SimulationType.DEVICE_LOCATION,
+        data=DeviceLocationBatchSimulationData(
+            positions=[
+                DeviceLocationBatchEntry(
+                    child_simulation_instance_id=3 + i,
+                    ue=10 + i,
+                    ue_instance=20 + i,
+                    latitude=40.6305 + i / 1000,
+                    longitude=-8.6582 - i / 1000,
+                    # The timestamps have a milliseconds resolution
+                    timestamp=datetime(2026, 10, 18, 21, 19, 37, 123000 * i)
+                )
+                for i in range(3)
+            ]
+        )
+    )
+
+
+def single_position():
+    return SimulationData(
+        simulation_id=1,
+        simulation_instance_id=2,
+        child_simulation_instance_id=3,
+        simulation_type=SimulationType.DEVICE_LOCATION,
+        data=DeviceLocationSimulationData(
+            ue=10,
+            ue_instance=20,
+            latitude=40.6305,
+            longitude=-8.6582,
+            timestamp="2026-10-18T21:19:37.123000Z"
+        )
+    )
+
+
+def properties(content_type):
+    return SimpleNamespace(content_type=content_type)
+
+
+@pytest.mark.parametrize('binary_encoding', [True, False])
+def test_location_batch_round_trip(monkeypatch, binary_encoding):
+    monkeypatch.setattr(
+        Encoding.Constants, "BINARY_ENCODING", binary_encoding
+    )
+    simulation_data = location_batch()
+
+    body, content_type = Encoding.encode(simulation_data)
+    decoded = SimulationData(
+        **Encoding.decode(body, properties(content_type))
+    )
+
+    if binary_encoding:
+        assert content_type == Encoding.CONTENT_TYPE_LOCATION_BATCH
+        assert isinstance(body, bytes)
+    else:
+        assert content_type == Encoding.CONTENT_TYPE_JSON
+    assert decoded.simulation_id == simulation_data.simulation_id
+    assert decoded.simulation_instance_id == \
+        simulation_data.simulation_instance_id
+    assert decoded.simulation_type == simulation_data.simulation_type
+    assert decoded.scope == simulation_data.scope
+    assert DeviceLocationBatchSimulationData(**decoded.data) == \
+        simulation_data.data
+
+
+def test_empty_location_batch_round_trip():
+    simulation_data = location_batch()
+    simulation_data.data.positions = []
+
+    body, content_type = Encoding.encode(simulation_data)
+    decoded = SimulationData(
+        **Encoding.decode(body, properties(content_type))
+    )
+
+    assert DeviceLocationBatchSimulationData(**decoded.data) == \
+        simulation_data.data
+
+
+def test_single_position_round_trip():
+    simulation_data = single_position()
+
+    body, content_type = Encoding.encode(simulation_data)
+    decoded = SimulationData(
+        **Encoding.decode(body, properties(content_type))
+    )
+
+    # Only the batches have a binary encoding
+    assert content_type == Encoding.CONTENT_TYPE_JSON
+    assert decoded.model_dump() == simulation_data.model_dump()
+    assert DeviceLocationSimulationData(**decoded.data) == \
+        simulation_data.data
+
+
+@pytest.mark.parametrize('message', [location_batch, single_position])
+def test_messages_without_content_type_are_decoded_as_json(message):
+    simulation_data = message()
+
+    # Messages published before the content type was set are JSON
+    decoded = SimulationData(
+        **Encoding.decode(simulation_data.model_dump_json())
+    )
+
+    assert decoded.model_dump(mode="json") == \
+        simulation_data.model_dump(mode="json")
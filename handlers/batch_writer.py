@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 15:41:52
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 15:41:52
+import logging
+import config # noqa
+import constants as Constants
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+from common.database import crud
+
+
+def is_retryable_error(error):
+    # Database errors are transient (e.g., a locked database or a dropped
+    # connection), unless they are caused by the rows being written
+    return isinstance(error, DBAPIError) and \
+        not isinstance(error, (DataError, IntegrityError))
+
+
+class BatchWriter:
+    # Write-behind buffer of a handlers worker. The rows of each delivered
+    # message are buffered and bulk inserted when enough rows are buffered
+    # or when the oldest buffered message reaches the maximum latency. The
+    # messages are only acknowledged after their rows are committed. It must
+    # be used from the thread that runs the worker's connection. After each
+    # flush, on_flushed is called with the entries that were committed
+
+    def __init__(
+        self, db, connection, channel, on_flushed=None,
+        max_rows=Constants.HANDLERS_BATCH_MAX_ROWS,
+        max_latency=Constants.HANDLERS_BATCH_MAX_LATENCY,
+        requeue_delay=Constants.HANDLERS_REQUEUE_DELAY
+    ):
+        self.db = db
+        self.connection = connection
+        self.channel = channel
+        self.max_rows = max_rows
+        self.max_latency = max_latency
+        self.requeue_delay = requeue_delay
+        self.on_flushed = on_flushed
+        # Pending (delivery tag, entries) of each message, where the entries
+        # map each simulation data model to the message's rows
+        self.pending = []
+        self.pending_rows = 0
+        self.timer = None
+
+    def add(self, delivery_tag, entries):
+        self.pending.append((delivery_tag, entries))
+        self.pending_rows += sum(len(rows) for rows in entries.values())
+
+        if self.pending_rows >= self.max_rows:
+            self.flush()
+        elif self.timer is None:
+            self.timer = self.connection.call_later(
+                self.max_latency,
+                self._on_timer
+            )
+
+    def _on_timer(self):
+        self.timer = None
+        self.flush()
+
+    def flush(self):
+        if self.timer is not None:
+            self.connection.remove_timeout(self.timer)
+            self.timer = None
+
+        pending = self.pending
+        self.pending = []
+        self.pending_rows = 0
+
+        if not pending:
+            return
+
+        written_entries = self._write(pending)
+        if self.on_flushed is not None:
+            self.on_flushed(written_entries)
+
+    def _write(self, pending):
+        # Returns the entries that were committed
+        entries = {}
+        for _, message_entries in pending:
+            for model, rows in message_entries.items():
+                entries.setdefault(model, []).extend(rows)
+
+        try:
+            crud.create_simulation_data_entries(self.db, entries)
+        except Exception as e:
+            if is_retryable_error(e):
+                logging.warning(
+                    f"Could not write the rows of {len(pending)} messages. " +
+                    f"They will be requeued. Reason: {e}"
+                )
+                self.requeue(pending[-1][0], multiple=True)
+                return []
+            logging.warning(
+                f"Could not bulk insert the rows of {len(pending)} " +
+                "messages. Will insert them one message at a time. " +
+                f"Reason: {e}"
+            )
+            return self._write_each_message(pending)
+
+        # Every message delivered before the last pending one was either
+        # already rejected or is part of this batch
+        self.channel.basic_ack(
+            delivery_tag=pending[-1][0],
+            multiple=True
+        )
+        return [entries]
+
+    def requeue(self, delivery_tag, multiple=False):
+        # Waits before requeueing, so that the messages are not redelivered
+        # in a loop while the database is unavailable. Meanwhile, the
+        # connection keeps answering the broker, but, since this is called
+        # from the connection's callbacks, no other message is dispatched
+        self.connection.sleep(self.requeue_delay)
+        self.channel.basic_nack(
+            delivery_tag=delivery_tag,
+            multiple=multiple,
+            requeue=True
+        )
+
+    def _write_each_message(self, pending):
+        # Isolates the messages whose rows can't be written, which are
+        # rejected without being requeued, since they would keep failing
+        written_entries = []
+        for delivery_tag, entries in pending:
+            try:
+                crud.create_simulation_data_entries(self.db, entries)
+            except Exception as e:
+                if is_retryable_error(e):
+                    # The earlier messages were already acknowledged, so
+                    # this one and the remaining ones are requeued
+                    logging.warning(
+                        "Could not write the rows of a message. It and the " +
+                        f"following ones will be requeued. Reason: {e}"
+                    )
+                    self.requeue(pending[-1][0], multiple=True)
+                    return written_entries
+                logging.error(
+                    "Error writing the simulation data of a message. " +
+                    f"Reason: {e}"
+                )
+                self.channel.basic_nack(
+                    delivery_tag=delivery_tag,
+                    requeue=False
+                )
+                continue
+            self.channel.basic_ack(delivery_tag=delivery_tag)
+            written_entries.append(entries)
+
+        return written_entries
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 15:02:11
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 15:02:11
+import os
+
+# Number of worker processes consuming the simulation data queue. The
+# device status data is sharded between them, by UE. Each worker has its
+# own broker connection and database session
+HANDLERS_WORKERS = int(
+    os.environ.get("HANDLERS_WORKERS", os.cpu_count() or 1)
+)
+
+# Seconds to wait before restarting a worker process that exited
+HANDLERS_WORKER_RESTART_DELAY = float(
+    os.environ.get("HANDLERS_WORKER_RESTART_DELAY", 5.0)
+)
+
+# Maximum number of unacknowledged messages delivered to each worker. A
+# message is only acknowledged after its data is written to the database
+HANDLERS_PREFETCH_COUNT = int(
+    os.environ.get("HANDLERS_PREFETCH_COUNT", 100)
+)
+
+# The rows of the received simulation data are buffered and bulk inserted,
+# in a single transaction, when HANDLERS_BATCH_MAX_ROWS rows are buffered
+# or HANDLERS_BATCH_MAX_LATENCY seconds after the first buffered message.
+# The messages are acknowledged after their rows are written
+HANDLERS_BATCH_MAX_ROWS = int(
+    os.environ.get("HANDLERS_BATCH_MAX_ROWS", 5000)
+)
+HANDLERS_BATCH_MAX_LATENCY = float(
+    os.environ.get("HANDLERS_BATCH_MAX_LATENCY", 0.1)
+)
+
+# Messages whose data could not be written due to a database error (e.g., a
+# locked database or a dropped connection) are requeued after waiting
+# HANDLERS_REQUEUE_DELAY seconds
+HANDLERS_REQUEUE_DELAY = float(
+    os.environ.get("HANDLERS_REQUEUE_DELAY", 1.0)
+)
+
+# Maximum number of UEs whose last known device status is kept in memory
+DEVICE_STATUS_CACHE_SIZE = 100000
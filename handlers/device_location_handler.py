@@ -7,12 +7,17 @@
 
 from datetime import datetime
 import config # noqa
-from common.database import crud
+from common.database import models
+from common.message_broker import schemas as SimulationSchemas
 import logging
 
 
 class DeviceLocationHandler():
 
+    # The handlers return the rows to be inserted, by simulation data model,
+    # which are then written in bulk by the batch writer. None is returned
+    # if the message could not be processed
+
     @staticmethod
     def process_message(simulation_data, db):
         try:
@@ -24,17 +29,52 @@ class DeviceLocationHandler():
                 '%Y-%m-%dT%H:%M:%SZ'
             )
 
-            crud.create_device_location_simulation_data_entry(
-                db=db,
-                simulation_instance=simulation_data.simulation_instance_id,
-                child_simulation_instance=simulation_data
-                .child_simulation_instance_id,
-                ue_id=simulation_data.data["ue_instance"],
-                latitude=simulation_data.data["latitude"],
-                longitude=simulation_data.data["longitude"],
-                timestamp=timestamp_dt,
-            )
+            return {
+                models.DeviceLocationSimulationData: [
+                    {
+                        "simulation_instance": simulation_data
+                        .simulation_instance_id,
+                        "child_simulation_instance": simulation_data
+                        .child_simulation_instance_id,
+                        "ue": simulation_data.data["ue_instance"],
+                        "latitude": simulation_data.data["latitude"],
+                        "longitude": simulation_data.data["longitude"],
+                        "timestamp": timestamp_dt,
+                    }
+                ]
+            }
         except Exception as e:
             logging.error(
                 f"Error processing Device Location message. Reason: {e}"
             )
+            return None
+
+    @staticmethod
+    def process_batch_message(simulation_data, db):
+        try:
+            batch = SimulationSchemas.DeviceLocationBatchSimulationData(
+                **simulation_data.data
+            )
+        except Exception as e:
+            logging.error(
+                "Error processing Device Location batch message. Reason: " +
+                f"{e}"
+            )
+            return None
+
+        # The positions of a batch already have their timestamp parsed
+        return {
+            models.DeviceLocationSimulationData: [
+                {
+                    "simulation_instance": simulation_data
+                    .simulation_instance_id,
+                    "child_simulation_instance": position
+                    .child_simulation_instance_id,
+                    "ue": position.ue_instance,
+                    "latitude": position.latitude,
+                    "longitude": position.longitude,
+                    "timestamp": position.timestamp,
+                }
+                for position in batch.positions
+            ]
+        }
@@ -4,55 +4,130 @@
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2024-01-10 11:03:09
 
+from collections import OrderedDict
 import config # noqa
+import constants as Constants
+from sqlalchemy.exc import DBAPIError
 from common.database import crud
+from common.database import models
 import logging
 import json
 
 
 class DeviceStatusHandler():
 
-    @staticmethod
-    def process_message(simulation_data, db):
+    # Last known status of each (simulation instance, UE). A status is
+    # seeded from the database (i.e., from the UE's initial status) the
+    # first time the UE is seen, and is then kept up to date in memory.
+    # Thus, the device status data of each UE must be handled by a single
+    # worker, the one of its shard
+    states = OrderedDict()
+    # Statuses of the messages whose rows were not committed yet. They are
+    # only moved to the last known statuses once committed, so that a
+    # rejected batch does not leave them ahead of the database
+    pending_states = {}
+
+    @classmethod
+    def get_last_state(cls, db, simulation_instance, ue_id):
+        key = (simulation_instance, ue_id)
+
+        state = cls.pending_states.get(key)
+        if state is not None:
+            return state
+
+        state = cls.states.get(key)
+        if state is not None:
+            cls.states.move_to_end(key)
+            return state
+
+        last_entry = crud.get_last_device_status_entry(
+            db=db,
+            simulation_instance=simulation_instance,
+            ue_id=ue_id
+        )
+        state = {
+            "connectivity_status": last_entry.connectivity_status,
+            "roaming": last_entry.roaming,
+            "country_code": last_entry.country_code,
+            "country_name": json.loads(last_entry.country_name),
+        }
+        cls.set_last_state(simulation_instance, ue_id, state)
+        return state
+
+    @classmethod
+    def set_last_state(cls, simulation_instance, ue_id, state):
+        cls.states[(simulation_instance, ue_id)] = state
+        cls.states.move_to_end((simulation_instance, ue_id))
+        # Evict the least recently updated statuses
+        while len(cls.states) > Constants.DEVICE_STATUS_CACHE_SIZE:
+            cls.states.popitem(last=False)
+
+    @classmethod
+    def on_flushed(cls, written_entries):
+        # Called by the batch writer after each flush, when every pending
+        # message was either committed, rejected or requeued. Only the
+        # committed statuses become the last known ones
+        for entries in written_entries:
+            for row in entries.get(models.DeviceStatusSimulationData, []):
+                cls.set_last_state(
+                    row["simulation_instance"],
+                    row["ue"],
+                    {
+                        "connectivity_status": row["connectivity_status"],
+                        "roaming": row["roaming"],
+                        "country_code": row["country_code"],
+                        "country_name": json.loads(row["country_name"]),
+                    }
+                )
+        cls.pending_states.clear()
+
+    @classmethod
+    def process_message(cls, simulation_data, db):
         try:
             logging.debug(f" [x] Received {simulation_data}")
 
             # 1. Get last simulation data
-            device_status_simulation_data = crud.get_last_device_status_entry(
+            last_state = cls.get_last_state(
                 db=db,
                 simulation_instance=simulation_data.simulation_instance_id,
                 ue_id=simulation_data.data["ue_instance"]
             )
 
             # 2. Evaluate which fields should be updated
-            connectivity_status = simulation_data.data["connectivity_status"] \
-                if simulation_data.data["connectivity_status"] \
-                else device_status_simulation_data.connectivity_status
-
-            roaming = simulation_data.data["roaming"] \
-                if simulation_data.data["roaming"] \
-                else device_status_simulation_data.roaming
-
-            country_code = simulation_data.data["country_code"] \
-                if simulation_data.data["country_code"] \
-                else device_status_simulation_data.country_code
-            country_name = simulation_data.data["country_name"] \
-                if simulation_data.data["country_name"] \
-                else json.loads(device_status_simulation_data.country_name)
+            state = {
+                field: simulation_data.data[field]
+                if simulation_data.data[field]
+                else last_state[field]
+                for field in last_state
+            }
+            cls.pending_states[(
+                simulation_data.simulation_instance_id,
+                simulation_data.data["ue_instance"]
+            )] = state
 
             # 3. Update simulation data
-            crud.create_device_status_simulation_data_entry(
-                db=db,
-                simulation_instance=simulation_data.simulation_instance_id,
-                child_simulation_instance=simulation_data
-                .child_simulation_instance_id,
-                ue_id=simulation_data.data["ue_instance"],
-                connectivity_status=connectivity_status,
-                roaming=roaming,
-                country_code=country_code,
-                country_name=country_name
-            )
+            return {
+                models.DeviceStatusSimulationData: [
+                    {
+                        "simulation_instance": simulation_data
+                        .simulation_instance_id,
+                        "child_simulation_instance": simulation_data
+                        .child_simulation_instance_id,
+                        "ue": simulation_data.data["ue_instance"],
+                        "connectivity_status": state["connectivity_status"],
+                        "roaming": state["roaming"],
+                        "country_code": state["country_code"],
+                        "country_name": json.dumps(
+                            state["country_name"] or []
+                        ),
+                    }
+                ]
+            }
+        except DBAPIError:
+            # The message is requeued by the worker
+            raise
         except Exception as e:
             logging.error(
                 f"Error processing Device Location message. Reason: {e}"
             )
+            return None
@@ -4,50 +4,203 @@
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2024-01-10 10:48:19
 import sys
-import json
+import time
 import logging
+import multiprocessing
+import multiprocessing.connection
 import config # noqa
+import constants as Constants
+from sqlalchemy.exc import DBAPIError
 from device_location_handler import DeviceLocationHandler
 from sim_swap_handler import SIMSwapHandler
 from device_status_handler import DeviceStatusHandler
+from batch_writer import BatchWriter
 from common.message_broker import connections_factory as PikaFactory
+from common.message_broker import aux as MessageBrokerAux
 from common.simulation.simulation_types import SimulationType
 from common.message_broker.topics import Topics
+from common.message_broker import encoding as Encoding
 from common.database import connections_factory as DBFactory
+from common.database.database import engine
 from common.message_broker import schemas as SimulationSchemas
 
 
-def main():
+def process_message(simulation_data, db):
+    # Returns the rows to be written, by simulation data model, or None if
+    # the message could not be processed
+    if simulation_data.simulation_type == SimulationType.DEVICE_LOCATION:
+        # The UEs' positions may be received in batches
+        if "positions" in simulation_data.data:
+            return DeviceLocationHandler.process_batch_message(
+                simulation_data, db
+            )
+        return DeviceLocationHandler.process_message(simulation_data, db)
+
+    elif simulation_data.simulation_type == SimulationType.SIM_SWAP:
+        return SIMSwapHandler.process_message(simulation_data, db)
+
+    elif simulation_data.simulation_type == SimulationType.DEVICE_STATUS:
+        return DeviceStatusHandler.process_message(simulation_data, db)
+
+    logging.warning(
+        "Discarding message of unknown simulation type " +
+        f"{simulation_data.simulation_type}."
+    )
+    return None
+
+
+def setup_device_status_queues(workers):
+    # One device status queue per worker is bound to the consistent hash
+    # exchange before the workers start. Thus, the UEs are not remapped
+    # while the workers start or restart. Returns the shards of the queues
+    # left by a previous run with more workers
+    connection, channel = PikaFactory.get_new_pika_connection_and_channel()
+    for shard in range(workers):
+        MessageBrokerAux.create_device_status_queue_if_doesnt_exist(
+            channel, shard
+        )
+    retired_shards = MessageBrokerAux.retire_device_status_queues(
+        channel, workers
+    )
+    if connection.is_open:
+        connection.close()
+    return retired_shards
+
+
+def worker_shards(worker_id, workers, retired_shards):
+    # Each worker consumes the device status queue of its own shard, and
+    # drains some of the retired ones
+    return [worker_id] + [
+        shard
+        for shard in retired_shards
+        if shard % workers == worker_id
+    ]
+
+
+def run_worker(worker_id, shards):
+    # The database connections inherited from the parent process must not
+    # be used by the worker
+    engine.dispose(close=False)
+
     # Start RabbitMQ Consumer Connection
-    _, channel = PikaFactory.get_new_pika_connection_and_channel()
+    connection, channel = PikaFactory.get_new_pika_connection_and_channel()
+    channel.basic_qos(prefetch_count=Constants.HANDLERS_PREFETCH_COUNT)
 
     db = DBFactory.new_db_session()
+    batch_writer = BatchWriter(
+        db, connection, channel,
+        on_flushed=DeviceStatusHandler.on_flushed
+    )
 
     def handlers_callback(ch, method, properties, body):
+        try:
+            simulation_data = SimulationSchemas\
+                .SimulationData(**Encoding.decode(body, properties))
+        except Exception as e:
+            logging.error(f"Discarding invalid message. Reason: {e}")
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
 
-        simulation_data = SimulationSchemas\
-            .SimulationData(**json.loads(body))
-
-        logging.debug(f"[x] Received {simulation_data}")
-
-        if simulation_data.simulation_type == SimulationType.DEVICE_LOCATION:
-            DeviceLocationHandler.process_message(simulation_data, db)
+        logging.debug(f"[x] Worker {worker_id} received {simulation_data}")
 
-        elif simulation_data.simulation_type == SimulationType.SIM_SWAP:
-            SIMSwapHandler.process_message(simulation_data, db)
+        # The message is only acknowledged after its rows are written to the
+        # database. If the worker dies before that, the broker delivers it
+        # to another worker. Messages that could not be read from the
+        # database are requeued, while the ones that could not be processed
+        # are not, since they would keep failing
+        try:
+            entries = process_message(simulation_data, db)
+        except DBAPIError as e:
+            db.rollback()
+            logging.warning(
+                "Could not process a message. It will be requeued. " +
+                f"Reason: {e}"
+            )
+            batch_writer.requeue(method.delivery_tag)
+            return
 
-        elif simulation_data.simulation_type == SimulationType.DEVICE_STATUS:
-            DeviceStatusHandler.process_message(simulation_data, db)
+        if entries is None:
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+        else:
+            batch_writer.add(method.delivery_tag, entries)
 
     # Start consuming
     channel.basic_consume(
         queue=Topics.SIMULATION_DATA.value,
         on_message_callback=handlers_callback,
-        auto_ack=True
+        auto_ack=False
+    )
+    # The device status updates are merged with the last known status of
+    # each UE, which is kept in memory. Thus, the updates of each UE are
+    # routed to a single shard, which is handled, in order, by a single
+    # worker. The orchestrator restarts the workers that exit
+    for shard in shards:
+        channel.basic_consume(
+            queue=MessageBrokerAux.device_status_queue(shard),
+            on_message_callback=handlers_callback,
+            auto_ack=False
+        )
+
+    logging.info(
+        f"[*] Worker {worker_id} waiting for messages. To exit press CTRL+C"
     )
+    try:
+        channel.start_consuming()
+    except KeyboardInterrupt:
+        pass
+
+
+def start_worker(context, worker_id, shards):
+    worker = context.Process(target=run_worker, args=(worker_id, shards))
+    worker.start()
+    return worker
 
-    logging.info('[*] Waiting for messages. To exit press CTRL+C')
-    channel.start_consuming()
+
+def main():
+    # The workers compete for the messages of the simulation data queue,
+    # while the device status data is sharded between them
+    workers_count = max(Constants.HANDLERS_WORKERS, 1)
+    retired_shards = setup_device_status_queues(workers_count)
+    shards = {
+        worker_id: worker_shards(worker_id, workers_count, retired_shards)
+        for worker_id in range(workers_count)
+    }
+
+    if workers_count == 1:
+        run_worker(0, shards[0])
+        return
+
+    context = multiprocessing.get_context("fork")
+    workers = {
+        worker_id: start_worker(context, worker_id, shards[worker_id])
+        for worker_id in range(workers_count)
+    }
+
+    logging.info(f"Started {len(workers)} handlers workers.")
+
+    try:
+        # The workers that exit are restarted. Otherwise, the device status
+        # data of their shards would no longer be handled
+        while True:
+            multiprocessing.connection.wait(
+                [worker.sentinel for worker in workers.values()]
+            )
+            for worker_id, worker in list(workers.items()):
+                if worker.is_alive():
+                    continue
+                logging.error(
+                    f"Handlers worker {worker_id} exited with code " +
+                    f"{worker.exitcode}. Restarting it in " +
+                    f"{Constants.HANDLERS_WORKER_RESTART_DELAY} seconds..."
+                )
+                time.sleep(Constants.HANDLERS_WORKER_RESTART_DELAY)
+                workers[worker_id] = start_worker(
+                    context, worker_id, shards[worker_id]
+                )
+    finally:
+        for worker in workers.values():
+            if worker.is_alive():
+                worker.terminate()
 
 
 if __name__ == '__main__':
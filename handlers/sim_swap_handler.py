@@ -7,7 +7,7 @@
 
 from datetime import datetime
 import config # noqa
-from common.database import crud
+from common.database import models
 import logging
 
 
@@ -18,19 +18,24 @@ class SIMSwapHandler():
         try:
             logging.debug(f" [x] Received {simulation_data}")
 
-            crud.create_sim_swap_simulation_data_entry(
-                db=db,
-                simulation_instance=simulation_data.simulation_instance_id,
-                child_simulation_instance=simulation_data
-                .child_simulation_instance_id,
-                ue_id=simulation_data.data["ue_instance"],
-                new_msisdn=simulation_data.data["new_msisdn"],
-                timestamp=datetime.strptime(
-                    simulation_data.data["timestamp"],
-                    '%Y-%m-%dT%H:%M:%SZ'
-                )
-            )
+            return {
+                models.SimSwapSimulationData: [
+                    {
+                        "simulation_instance": simulation_data
+                        .simulation_instance_id,
+                        "child_simulation_instance": simulation_data
+                        .child_simulation_instance_id,
+                        "ue": simulation_data.data["ue_instance"],
+                        "new_msisdn": simulation_data.data["new_msisdn"],
+                        "timestamp": datetime.strptime(
+                            simulation_data.data["timestamp"],
+                            '%Y-%m-%dT%H:%M:%SZ'
+                        ),
+                    }
+                ]
+            }
         except Exception as e:
             logging.error(
                 f"Error processing SIM Swap message. Reason: {e}"
             )
+            return None
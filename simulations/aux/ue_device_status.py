@@ -4,13 +4,17 @@
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2024-01-10 17:51:11
 
-import time
-from datetime import datetime
+import threading
 import logging
 import config # noqa
 from common.simulation.simulation_types import SimulationType
 from common.message_broker import schemas as SimulationSchemas
-from common.message_broker.topics import Topics
+from common.message_broker import constants as MessageBrokerConstants
+from common.message_broker import aux as MessageBrokerAux
+from common.message_broker.publisher_pool import (
+    publisher_pool as PublisherPool
+)
+from common.simulation.clock import clock as SimulationClock
 
 
 class UEDeviceStatus():
@@ -18,10 +22,10 @@ class UEDeviceStatus():
     simulation_type = SimulationType.DEVICE_STATUS
 
     def __init__(
-        self, simulation, ue, ue_instance, device_status_updates,
-        message_queue_connection, message_queue_channel
+        self, simulation, scheduler, ue, ue_instance, device_status_updates
     ):
         self.simulation = simulation
+        self.scheduler = scheduler
         self.ue = ue
         self.ue_instance = ue_instance
         self.device_status_updates = {
@@ -31,9 +35,12 @@ class UEDeviceStatus():
         }
 
         self.simulation_duration = max(list(self.device_status_updates.keys()))
-        self.message_queue_connection = message_queue_connection
-        self.message_queue_channel = message_queue_channel
         self.stop_event = False
+        self.lock = threading.Lock()
+        self.next_event = None
+        self.next_update = 0
+        self.start_time = None
+        self.updates_timestamps = sorted(self.device_status_updates.keys())
 
     def start_device_status_updates(self):
         logging.info(
@@ -42,26 +49,38 @@ class UEDeviceStatus():
             f"{self.simulation_duration} seconds"
         )
 
-        total_sleep_time = 0
+        # Register the first device status update in the scheduler. Each
+        # update will then register the following one
+        self.start_time = self.scheduler.now()
+        self._schedule_next_update()
 
-        while (
-            not self.stop_event
-            and
-            total_sleep_time <= self.simulation_duration
-        ):
-            # Check if SIM Swap should occur
-            if total_sleep_time in self.device_status_updates:
-                self.advertise_device_status(
-                    self.device_status_updates[total_sleep_time]
-                )
+    def _schedule_next_update(self):
+        self.next_event = self.scheduler.schedule_at(
+            self.start_time + self.updates_timestamps[self.next_update],
+            self._update
+        )
+
+    def _update(self):
+        with self.lock:
+            if self.stop_event:
+                return
+
+            self.advertise_device_status(
+                self.device_status_updates[
+                    self.updates_timestamps[self.next_update]
+                ]
+            )
+            self.next_update += 1
+
+            if self.next_update < len(self.updates_timestamps):
+                self._schedule_next_update()
+                return
 
-            # Wait 1 second
-            time.sleep(1)
-            total_sleep_time += 1
+            self.stop_event = True
 
-        # Close producer connection
-        self.message_queue_connection.close()
+        self._finish()
 
+    def _finish(self):
         # Signal that the UE has stopped
         # When all UEs are stopped, the simulation can be considered as
         # concluded
@@ -69,7 +88,14 @@ class UEDeviceStatus():
 
     def stop(self):
         logging.info(f"Stopping Device Status simulation for UE '{self.ue}'.")
-        self.stop_event = True
+        with self.lock:
+            if self.stop_event:
+                return
+            self.stop_event = True
+            if self.next_event:
+                self.next_event.cancel()
+
+        self._finish()
 
     def advertise_device_status(self, status):
 
@@ -86,7 +112,7 @@ class UEDeviceStatus():
                 roaming=status.get("roaming"),
                 country_code=status.get("country_code"),
                 country_name=status.get("country_name"),
-                timestamp=datetime.utcnow()
+                timestamp=SimulationClock.utcnow()
             )
         )
 
@@ -106,14 +132,14 @@ class UEDeviceStatus():
         )
 
         # Send Payload
-        self.message_queue_channel.basic_publish(
-            exchange='',
-            routing_key=Topics.SIMULATION_DATA.value,
-            body=simulation_data.model_dump_json()
-        )
-
-        self.message_queue_channel.basic_publish(
-            exchange='',
-            routing_key=Topics.EVENTS.value,
+        # Published once to the data exchange, which delivers it to the
+        # handlers worker of its shard and to the events module
+        PublisherPool.publish(
+            exchange=MessageBrokerConstants.DATA_EXCHANGE,
+            routing_key=MessageBrokerAux.device_status_routing_key(
+                simulation_instance_id=self.simulation
+                .simulation_instance_id,
+                ue_instance=self.ue_instance
+            ),
             body=simulation_data.model_dump_json()
         )
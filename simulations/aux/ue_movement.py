@@ -4,13 +4,13 @@
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2023-12-22 20:52:02
 
-import time
-from datetime import datetime
+import threading
 import logging
 import config # noqa
+import constants as Constants
 from common.simulation.simulation_types import SimulationType
 from common.message_broker import schemas as SimulationSchemas
-from common.message_broker.topics import Topics
+from common.simulation.clock import clock as SimulationClock
 
 
 class UEMovement():
@@ -19,41 +19,71 @@ class UEMovement():
     simulation_type = SimulationType.DEVICE_LOCATION
 
     def __init__(
-        self, simulation, ue, ue_instance, itinerary, simulation_duration,
-        message_queue_connection, message_queue_channel
+        self, simulation, scheduler, ue, ue_instance, trajectory,
+        simulation_duration
     ):
         self.simulation = simulation
+        self.scheduler = scheduler
         self.ue = ue
         self.ue_instance = ue_instance
-        self.itinerary = itinerary
+        self.trajectory = trajectory
         self.simulation_duration = simulation_duration
-        self.message_queue_connection = message_queue_connection
-        self.message_queue_channel = message_queue_channel
         self.stop_event = False
-        # Compute the sleep step time for conducting the movements
-        self._set_sleep_time()
-
-    def _set_sleep_time(self):
-        self.sleep_step = self.simulation_duration / (len(self.itinerary) - 1)
+        self.lock = threading.Lock()
+        self.next_event = None
+        self.current_step = 0
+        self.start_time = None
+        # The UE's location is advertised at a fixed rate, regardless of the
+        # length of its itinerary
+        self.sleep_step = Constants.LOCATION_EMIT_INTERVAL
 
     def move(self):
         logging.info(
             f"Will start a simulation for UE Instance '{self.ue_instance}' " +
             f"(UE {self.ue}), for {self.simulation_duration} seconds"
         )
+        # Register the first movement in the scheduler. The following ones
+        # will be registered by each movement step
+        self.start_time = self.scheduler.now()
+        self._schedule_next_step()
+
+    def _next_step_time(self):
+        # Seconds since the start of the simulation. The last step always
+        # happens at the end of the simulation
+        return min(
+            (self.current_step + 1) * self.sleep_step,
+            self.simulation_duration
+        )
+
+    def _schedule_next_step(self):
+        self.next_event = self.scheduler.schedule_at(
+            self.start_time + self._next_step_time(),
+            self._step
+        )
 
-        for _, coordinates in self.itinerary:
+    def _step(self):
+        with self.lock:
             # The self.stop_event variable is used to stop the simulation
             # during running time
             if self.stop_event:
-                break
+                return
+
+            step_time = self._next_step_time()
+            self.advertise_current_location(
+                self.trajectory.position_at(step_time)
+            )
+            self.current_step += 1
+
             # Sleep for a while before moving the UE again
-            time.sleep(self.sleep_step)
-            self.advertise_current_location(coordinates[::-1])
+            if step_time < self.simulation_duration:
+                self._schedule_next_step()
+                return
 
-        # Close producer connection
-        self.message_queue_connection.close()
+            self.stop_event = True
 
+        self._finish()
+
+    def _finish(self):
         # Signal that the UE has stopped
         # When all UEs are stopped, the simulation can be considered as
         # concluded
@@ -61,28 +91,28 @@ class UEMovement():
 
     def stop(self):
         logging.info(f"Stopping simulation for UE '{self.ue}'.")
-        self.stop_event = True
+        with self.lock:
+            # The UE has already reached the end of its itinerary
+            if self.stop_event:
+                return
+            self.stop_event = True
+            if self.next_event:
+                self.next_event.cancel()
+
+        self._finish()
 
     def advertise_current_location(self, location):
         # Get current UTC time
-        current_time = datetime.utcnow()
-
-        # Format the time as a string
-        formatted_time = current_time.strftime('%Y-%m-%dT%H:%M:%SZ')
+        current_time = SimulationClock.utcnow()
 
         # Build the payload
-        simulation_data = SimulationSchemas.SimulationData(
-            simulation_id=self.simulation.simulation_id,
-            simulation_instance_id=self.simulation.simulation_instance_id,
+        position = SimulationSchemas.DeviceLocationBatchEntry(
             child_simulation_instance_id=self.simulation.child_simulation_id,
-            simulation_type=self.simulation_type,
-            data=SimulationSchemas.DeviceLocationSimulationData(
-                ue=self.ue,
-                ue_instance=self.ue_instance,
-                latitude=location[0],
-                longitude=location[1],
-                timestamp=formatted_time
-            )
+            ue=self.ue,
+            ue_instance=self.ue_instance,
+            latitude=location[0],
+            longitude=location[1],
+            timestamp=current_time
         )
 
         # Output Payload for debugging
@@ -95,14 +125,6 @@ class UEMovement():
             f"{location}."
         )
 
-        # Send Payload
-        self.message_queue_channel.basic_publish(
-            exchange='',
-            routing_key=Topics.SIMULATION_DATA.value,
-            body=simulation_data.model_dump_json()
-        )
-        self.message_queue_channel.basic_publish(
-            exchange='',
-            routing_key=Topics.EVENTS.value,
-            body=simulation_data.model_dump_json()
-        )
+        # Send Payload. The positions of all the UEs of the simulation
+        # instance are published together, in batches
+        self.simulation.location_batcher.add(self.simulation, position)
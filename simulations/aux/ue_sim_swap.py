@@ -4,13 +4,16 @@
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2024-01-08 09:47:47
 
-import time
-from datetime import datetime
+import threading
 import logging
 import config # noqa
 from common.simulation.simulation_types import SimulationType
 from common.message_broker import schemas as SimulationSchemas
-from common.message_broker.topics import Topics
+from common.message_broker import constants as MessageBrokerConstants
+from common.message_broker.publisher_pool import (
+    publisher_pool as PublisherPool
+)
+from common.simulation.clock import clock as SimulationClock
 
 
 class UESIMSwap():
@@ -18,21 +21,24 @@ class UESIMSwap():
     simulation_type = SimulationType.SIM_SWAP
 
     def __init__(
-        self, simulation, ue, ue_instance, timestamps_for_swaps_seconds,
-        message_queue_connection, message_queue_channel
+        self, simulation, scheduler, ue, ue_instance,
+        timestamps_for_swaps_seconds
     ):
         self.simulation = simulation
+        self.scheduler = scheduler
         self.ue = ue
         self.ue_instance = ue_instance
-        self.timestamps_for_swaps_seconds = sorted([
+        self.timestamps_for_swaps_seconds = sorted({
             int(ts)
             for ts
             in timestamps_for_swaps_seconds
-        ])
+        })
         self.simulation_duration = max(self.timestamps_for_swaps_seconds)
-        self.message_queue_connection = message_queue_connection
-        self.message_queue_channel = message_queue_channel
         self.stop_event = False
+        self.lock = threading.Lock()
+        self.next_event = None
+        self.next_swap = 0
+        self.start_time = None
 
     def start_sim_swapping(self):
         logging.info(
@@ -41,24 +47,35 @@ class UESIMSwap():
             f"{self.simulation_duration} seconds"
         )
 
-        total_sleep_time = 0
+        # Register the first SIM swap in the scheduler. Each SIM swap will
+        # then register the following one
+        self.start_time = self.scheduler.now()
+        self._schedule_next_swap()
 
-        while (
-            not self.stop_event
-            and
-            total_sleep_time <= self.simulation_duration
-        ):
-            # Check if SIM Swap should occur
-            if total_sleep_time in self.timestamps_for_swaps_seconds:
-                self.advertise_sim_swap()
+    def _schedule_next_swap(self):
+        self.next_event = self.scheduler.schedule_at(
+            self.start_time +
+            self.timestamps_for_swaps_seconds[self.next_swap],
+            self._swap
+        )
+
+    def _swap(self):
+        with self.lock:
+            if self.stop_event:
+                return
+
+            self.advertise_sim_swap()
+            self.next_swap += 1
 
-            # Wait 1 second
-            time.sleep(1)
-            total_sleep_time += 1
+            if self.next_swap < len(self.timestamps_for_swaps_seconds):
+                self._schedule_next_swap()
+                return
 
-        # Close producer connection
-        self.message_queue_connection.close()
+            self.stop_event = True
 
+        self._finish()
+
+    def _finish(self):
         # Signal that the UE has stopped
         # When all UEs are stopped, the simulation can be considered as
         # concluded
@@ -66,11 +83,18 @@ class UESIMSwap():
 
     def stop(self):
         logging.info(f"Stopping SIM Swap simulation for UE '{self.ue}'.")
-        self.stop_event = True
+        with self.lock:
+            if self.stop_event:
+                return
+            self.stop_event = True
+            if self.next_event:
+                self.next_event.cancel()
+
+        self._finish()
 
     def advertise_sim_swap(self):
         # Get current UTC time
-        current_time = datetime.utcnow()
+        current_time = SimulationClock.utcnow()
 
         # Format the time as a string
         formatted_time = current_time.strftime('%Y-%m-%dT%H:%M:%SZ')
@@ -100,8 +124,8 @@ class UESIMSwap():
         )
 
         # Send Payload
-        self.message_queue_channel.basic_publish(
-            exchange='',
-            routing_key=Topics.SIMULATION_DATA.value,
+        PublisherPool.publish(
+            exchange=MessageBrokerConstants.DATA_EXCHANGE,
+            routing_key=self.simulation_type.value,
             body=simulation_data.model_dump_json()
         )
@@ -3,22 +3,27 @@
 # @Date:   2023-12-06 22:11:09
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2023-12-22 11:10:57
-from datetime import datetime
 import logging
+import threading
 import config # noqa
 from common.database import crud
+from common.database import connections_factory as DBFactory
+from common.simulation.clock import clock as SimulationClock
 
 
 class Simulation:
     def __init__(
-        self, db, simulation_id, simulation_instance_id, child_simulation_id,
-        simulation_payload
+        self, scheduler, simulation_id, simulation_instance_id,
+        child_simulation_id, simulation_payload
     ):
-        self.db = db
+        self.scheduler = scheduler
         self.simulation_id = simulation_id
         self.simulation_instance_id = simulation_instance_id
         self.child_simulation_id = child_simulation_id
         self.simulation_payload = simulation_payload
+        # The UEs are driven by the scheduler workers. Thus, the UEs may
+        # signal that they have stopped from different threads
+        self.lock = threading.Lock()
 
     def start_simulation(self):
         logging.info(
@@ -27,11 +32,14 @@ class Simulation:
             f"(Simulation {self.simulation_id} is starting!"
         )
         # Update the stat timestamp of the current child simulation
-        crud.update_child_simulation_start_timestamp(
-            db=self.db,
-            child_simulation_id=self.child_simulation_id,
-            start_timestamp=datetime.utcnow()
-        )
+        # The simulations are driven by several threads. Thus, each unit of
+        # work uses its own thread's session
+        with DBFactory.session_scope() as db:
+            crud.update_child_simulation_start_timestamp(
+                db=db,
+                child_simulation_id=self.child_simulation_id,
+                start_timestamp=SimulationClock.utcnow()
+            )
 
     def stop_simulation(self):
         # This method will be overwritten in child classes
@@ -43,8 +51,9 @@ class Simulation:
             f"Simulation Instance {self.simulation_instance_id} " +
             f"(Simulation {self.simulation_id} has ended!"
         )
-        crud.update_child_simulation_end_timestamp(
-            db=self.db,
-            child_simulation_id=self.child_simulation_id,
-            end_timestamp=datetime.utcnow()
-        )
+        with DBFactory.session_scope() as db:
+            crud.update_child_simulation_end_timestamp(
+                db=db,
+                child_simulation_id=self.child_simulation_id,
+                end_timestamp=SimulationClock.utcnow()
+            )
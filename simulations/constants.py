@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 09:12:40
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 09:12:40
+import os
+
+# Number of worker threads used by the simulations scheduler to fire the
+# UEs' due events
+SCHEDULER_WORKERS = 4
+
+# Road graphs that can be used by the device location simulations. Each
+# region name is mapped to its GraphML file
+ROAD_GRAPHS = {
+    "aveiro": "aveiro.graphml",
+}
+DEFAULT_ROAD_GRAPH = "aveiro"
+
+# Maximum memory (in MB) that the loaded road graphs may use. When this
+# budget is exceeded, the least recently used graphs are evicted
+ROAD_GRAPHS_MEMORY_BUDGET_MB = 1024
+
+# Rough memory footprint of each node and edge of a loaded road graph.
+# These values are used to estimate the memory used by each graph
+ROAD_GRAPH_NODE_BYTES = 600
+ROAD_GRAPH_EDGE_BYTES = 1500
+
+# Maximum number of shortest paths, between two road graph nodes, and of
+# full itineraries kept in memory
+PATHS_CACHE_SIZE = 10000
+ITINERARIES_CACHE_SIZE = 1000
+
+# Directory where the computed itineraries are also stored. If None, the
+# itineraries are only cached in memory
+ITINERARIES_CACHE_DIR = None
+
+# Scale applied to the haversine heuristic of the routing's A* search. It
+# is slightly below 1, so that the heuristic stays admissible even when an
+# edge's length is a bit shorter than the straight line between its nodes
+ROUTING_HEURISTIC_SCALE = 0.99
+
+# Number of worker processes used to compute the itineraries of the
+# device location simulations
+ITINERARY_WORKERS = os.cpu_count() or 1
+
+# Interval, in seconds, between two consecutive locations advertised by a
+# moving UE. It does not depend on the length of the UE's itinerary
+LOCATION_EMIT_INTERVAL = 1
+
+# The locations of the UEs of a simulation instance are advertised in
+# batches. A batch is sent when it reaches LOCATION_BATCH_SIZE positions,
+# or LOCATION_BATCH_MAX_LATENCY seconds after its first position
+LOCATION_BATCH_SIZE = 500
+LOCATION_BATCH_MAX_LATENCY = 0.2
@@ -3,100 +3,136 @@
 # @Date:   2023-12-06 22:11:26
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2024-01-11 14:37:36
-import networkx
-import osmnx as ox
-import threading
+import logging
 import config # noqa
+import constants as Constants
+from itinerary_cache import cache as ItineraryCache
+from itinerary_pool import pool as ItineraryPool
+from trajectory import Trajectory
 from aux.ue_movement import UEMovement
 from base_simulation import Simulation
 from common.simulation.simulation_types import SimulationType
-from common.message_broker import connections_factory as PikaFactory
+from common.message_broker.publisher_pool import (
+    publisher_pool as PublisherPool
+)
 from common.message_broker import schemas as SimulationSchemas
 from common.database import crud
+from common.database import connections_factory as DBFactory
 from common.message_broker.topics import Topics
 
-ox.config(use_cache=True, log_console=True)
-
 
 class DeviceLocationSimulation(Simulation):
 
-    ue_threads = []
     moving_ues = []
     moving_ues_count = None
     simulation_type = SimulationType.DEVICE_LOCATION
 
     def __init__(
-        self, db, simulation_id, simulation_instance_id, child_simulation_id,
-        simulation_payload
+        self, scheduler, location_batcher, simulation_id,
+        simulation_instance_id, child_simulation_id, simulation_payload
     ):
-        # Load location graph
-        self.graph = ox.io.load_graphml('aveiro.graphml')
+        # Shared by all the device location simulations
+        self.location_batcher = location_batcher
+        # Road graph of the simulation's region. Each graph is only loaded
+        # once and is shared by all simulations
+        self.region = simulation_payload.get("region") or \
+            Constants.DEFAULT_ROAD_GRAPH
+        if self.region not in Constants.ROAD_GRAPHS:
+            raise ValueError(f"Unknown road graph region '{self.region}'.")
+        self.itinerary_future = None
+        self.stopped = False
         # Initialize super
         super().__init__(
-            db, simulation_id, simulation_instance_id, child_simulation_id,
-            simulation_payload
+            scheduler, simulation_id, simulation_instance_id,
+            child_simulation_id, simulation_payload
         )
 
-    def create_itinerary(self, stops, graph):
-
-        gdf_nodes = ox.graph_to_gdfs(graph)[0]
-        all_path_nodes = []
-        all_path_coord = []
-
-        # For every location in the route create an entry with a location_id, a
-        # start location and a path list from start to location
-        for i in range(1, len(stops)):
-            # Set Start and End
-            y1, x1 = [stops[i-1]["latitude"], stops[i-1]["longitude"]]
-            y2, x2 = [stops[i]["latitude"], stops[i]["longitude"]]
-
-            # Compute the nodes in the path as well as their coordinates
-            nodes = ox.nearest_nodes(G=graph, X=[x1, x2], Y=[y1, y2])
-            path_nodes = networkx.shortest_path(graph, nodes[0], nodes[1])
-            path_coord = gdf_nodes.loc[path_nodes][['x', 'y']]
+    def compute_itineraries(self, itinerary):
 
-            # save
-            all_path_nodes += path_nodes
-            all_path_coord += path_coord.values.tolist()
-
-        return list(zip(all_path_nodes, all_path_coord))
+        logging.info(
+            "Computed the itineraries of simulation " +
+            f"{self.simulation_id}. Itineraries cache stats: " +
+            f"{ItineraryCache.stats()}"
+        )
 
-    def compute_itineraries(self):
+        # All the UEs follow the same itinerary, during the same time. Thus,
+        # its trajectory is only compiled once and shared by all of them
+        trajectory = Trajectory(
+            itinerary=itinerary,
+            duration=self.simulation_payload["duration"]
+        )
 
         for ue_instance in self.simulation_payload["devices"]:
 
             # Get Root UE
-            ue = crud.get_simulated_device_id_from_simulated_device_instance(
-                db=self.db,
-                simulated_device_instance_id=ue_instance
-            )
+            with DBFactory.session_scope() as db:
+                ue = crud\
+                    .get_simulated_device_id_from_simulated_device_instance(
+                        db=db,
+                        simulated_device_instance_id=ue_instance
+                    )
 
             self.itineraries.append(
                 (
                     ue,
                     ue_instance,
                     self.simulation_payload["duration"],
-                    self.create_itinerary(
-                        stops=self.simulation_payload["itinerary"],
-                        graph=self.graph
-                    )
+                    trajectory
                 )
             )
 
     def signal_that_ue_has_stopped(self):
-        self.moving_ues_count -= 1
-        if self.moving_ues_count == 0:
-            # Inform Events Module that the Simulation has ended
-            self.inform_events_module_that_simulation_has_ended()
-            # Signal that the simulation has ended
-            self.signal_that_simulation_ended()
+        with self.lock:
+            self.moving_ues_count -= 1
+            simulation_has_ended = self.moving_ues_count == 0
+        if simulation_has_ended:
+            self.conclude_simulation()
+
+    def conclude_simulation(self):
+        # Inform Events Module that the Simulation has ended
+        self.inform_events_module_that_simulation_has_ended()
+        # Signal that the simulation has ended
+        self.signal_that_simulation_ended()
 
     def start_simulation(self):
 
         # create itineraries
         self.itineraries = []
         self.moving_ues = []
-        self.compute_itineraries()
+
+        # The itinerary is computed by the itinerary pool. Thus, the
+        # orchestrator can keep processing other messages in the meantime
+        self.itinerary_future = ItineraryPool.submit(
+            self.region,
+            self.simulation_payload["itinerary"]
+        )
+        self.itinerary_future.add_done_callback(self._on_itinerary_computed)
+
+    def _on_itinerary_computed(self, future):
+        # This callback runs on the pool's thread. Hand over the start of the
+        # UEs to the scheduler
+        self.scheduler.schedule(0, lambda: self._start_moving_ues(future))
+
+    def _start_moving_ues(self, future):
+        # The simulation was stopped before its itinerary was computed
+        if self.stopped:
+            return
+
+        # Without an itinerary, or with an empty one, the UEs have nowhere to
+        # move. Thus, the simulation ends right away
+        try:
+            self.compute_itineraries(future.result())
+        except Exception as e:
+            logging.error(
+                "Could not compute the itinerary of Child Simulation " +
+                f"Instance {self.child_simulation_id}. Reason: {e}"
+            )
+            with self.lock:
+                if self.stopped:
+                    return
+                self.stopped = True
+            self.conclude_simulation()
+            return
 
         # Start the simulation
         # The super start_simulation will handle everything that is common to
@@ -104,53 +140,67 @@ class DeviceLocationSimulation(Simulation):
         # start_timestamp
         super().start_simulation()
 
-        for ue, ue_instance, duration, itinerary in self.itineraries:
-            connection, channel = PikaFactory\
-                .get_new_pika_connection_and_channel()
-            self.moving_ues.append(
+        moving_ues = []
+        for ue, ue_instance, duration, trajectory in self.itineraries:
+            moving_ues.append(
                 UEMovement(
                     simulation=self,
+                    scheduler=self.scheduler,
                     ue=ue,
                     ue_instance=ue_instance,
-                    itinerary=itinerary,
-                    simulation_duration=duration,
-                    message_queue_channel=channel,
-                    message_queue_connection=connection
+                    trajectory=trajectory,
+                    simulation_duration=duration
                 )
             )
 
-        # Todo: Using threads is far from being the best approach to deal 
-        # Todo: with this
-        # Todo: This threading appraoch must be replaced by a more resilient 
-        # Todo: one
+        with self.lock:
+            # The simulation was stopped while the UEs were being created
+            stopped = self.stopped
+            if not stopped:
+                self.moving_ues = moving_ues
+                self.moving_ues_count = len(moving_ues)
+                # Without UEs, no UE will ever signal that it has stopped.
+                # Thus, the simulation ends right away
+                if not moving_ues:
+                    self.stopped = True
+
+        if stopped:
+            return
 
-        # Create threads
-        self.ue_threads = [
-            threading.Thread(target=ue.move)
-            for ue
-            in self.moving_ues
-        ]
-        self.moving_ues_count = len(self.ue_threads)
+        if not moving_ues:
+            self.conclude_simulation()
+            return
 
-        # Start the threads
-        for thread in self.ue_threads:
-            thread.start()
+        # Register the UEs in the scheduler
+        for ue in self.moving_ues:
+            ue.move()
 
     def stop_simulation(self):
-        # Stop all moving UEs
-        for moving_ue in self.moving_ues:
+        with self.lock:
+            if self.stopped:
+                return
+            self.stopped = True
+            moving_ues = self.moving_ues
+
+        # The simulation was stopped before its UEs started moving
+        if not moving_ues:
+            if self.itinerary_future:
+                self.itinerary_future.cancel()
+            self.conclude_simulation()
+            return
+
+        # Stop all UEs. Each stopped UE signals it to this simulation, and
+        # the last one to stop will conclude the simulation
+        for moving_ue in moving_ues:
             moving_ue.stop()
-        # Wait for all threads to finish
-        for thread in self.ue_threads:
-            thread.join()
-
-        # Inform Events Module that the Simulation has ended
-        self.inform_events_module_that_simulation_has_ended()
-
-        # Signal that the simulation has ended
-        self.signal_that_simulation_ended()
 
     def inform_events_module_that_simulation_has_ended(self):
+        # Publish the pending positions before the end of the simulation
+        self.location_batcher.flush(
+            self.simulation_id,
+            self.simulation_instance_id
+        )
+
         simulation_data = SimulationSchemas.SimulationData(
             simulation_id=self.simulation_id,
             simulation_instance_id=self.simulation_instance_id,
@@ -166,13 +216,7 @@ class DeviceLocationSimulation(Simulation):
             )
         )
 
-        _, channel = PikaFactory\
-            .get_new_pika_connection_and_channel()
-
-        channel.basic_publish(
-            exchange='',
+        PublisherPool.publish(
             routing_key=Topics.EVENTS.value,
             body=simulation_data.model_dump_json()
         )
-
-        channel.close()
@@ -3,41 +3,47 @@
 # @Date:   2023-12-06 22:11:26
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2024-01-11 14:37:19
-import threading
 import config # noqa
 from aux.ue_device_status import UEDeviceStatus
 from base_simulation import Simulation
 from common.simulation.simulation_types import SimulationType
-from common.message_broker import connections_factory as PikaFactory
+from common.message_broker.publisher_pool import (
+    publisher_pool as PublisherPool
+)
 from common.database import crud
+from common.database import connections_factory as DBFactory
 from common.message_broker import schemas as SimulationSchemas
 from common.message_broker.topics import Topics
 
 
 class DeviceStatusSimulation(Simulation):
 
-    ue_threads = []
     device_status_ues = []
     device_status_ues_count = None
     simulation_type = SimulationType.DEVICE_STATUS
 
     def __init__(
-        self, db, simulation_id, simulation_instance_id, child_simulation_id,
-        simulation_payload
+        self, scheduler, simulation_id, simulation_instance_id,
+        child_simulation_id, simulation_payload
     ):
         # Initialize super
         super().__init__(
-            db, simulation_id, simulation_instance_id, child_simulation_id,
-            simulation_payload
+            scheduler, simulation_id, simulation_instance_id,
+            child_simulation_id, simulation_payload
         )
 
     def signal_that_ue_has_stopped(self):
-        self.device_status_ues_count -= 1
-        if self.device_status_ues_count == 0:
-            # Inform Events Module that the Simulation has ended
-            self.inform_events_module_that_simulation_has_ended()
-            # Signal that the simulation has ended
-            self.signal_that_simulation_ended()
+        with self.lock:
+            self.device_status_ues_count -= 1
+            simulation_has_ended = self.device_status_ues_count == 0
+        if simulation_has_ended:
+            self.conclude_simulation()
+
+    def conclude_simulation(self):
+        # Inform Events Module that the Simulation has ended
+        self.inform_events_module_that_simulation_has_ended()
+        # Signal that the simulation has ended
+        self.signal_that_simulation_ended()
 
     def start_simulation(self):
         self.device_status_ues = []
@@ -50,57 +56,42 @@ class DeviceStatusSimulation(Simulation):
         for ue_instance in self.simulation_payload["devices"]:
 
             # Get Root UE
-            ue = crud.get_simulated_device_id_from_simulated_device_instance(
-                db=self.db,
-                simulated_device_instance_id=ue_instance
-            )
-
-            connection, channel = PikaFactory\
-                .get_new_pika_connection_and_channel()
+            with DBFactory.session_scope() as db:
+                ue = crud\
+                    .get_simulated_device_id_from_simulated_device_instance(
+                        db=db,
+                        simulated_device_instance_id=ue_instance
+                    )
 
             self.device_status_ues.append(
                 UEDeviceStatus(
                     simulation=self,
+                    scheduler=self.scheduler,
                     ue=ue,
                     ue_instance=ue_instance,
                     device_status_updates=self.simulation_payload[
                         "device_status_updates"
-                    ],
-                    message_queue_connection=connection,
-                    message_queue_channel=channel
+                    ]
                 )
             )
 
-        # Todo: Using threads is far from being the best approach to deal 
-        # Todo: with this
-        # Todo: This threading appraoch must be replaced by a more resilient 
-        # Todo: one
+        self.device_status_ues_count = len(self.device_status_ues)
 
-        # Create threads
-        self.ue_threads = [
-            threading.Thread(target=ue.start_device_status_updates)
-            for ue
-            in self.device_status_ues
-        ]
-        self.device_status_ues_count = len(self.ue_threads)
+        # Without UEs, no UE will ever signal that it has stopped. Thus, the
+        # simulation ends right away
+        if not self.device_status_ues:
+            self.conclude_simulation()
+            return
 
-        # Start the threads
-        for thread in self.ue_threads:
-            thread.start()
+        # Register the UEs in the scheduler
+        for ue in self.device_status_ues:
+            ue.start_device_status_updates()
 
     def stop_simulation(self):
-        # Stop all moving UEs
+        # Stop all UEs. Each stopped UE signals it to this simulation, and
+        # the last one to stop will conclude the simulation
         for device_status_ue in self.device_status_ues:
             device_status_ue.stop()
-        # Wait for all threads to finish
-        for thread in self.ue_threads:
-            thread.join()
-
-        # Inform Events Module that the Simulation has ended
-        self.inform_events_module_that_simulation_has_ended()
-
-        # Signal that the simulation has ended
-        self.signal_that_simulation_ended()
 
     def inform_events_module_that_simulation_has_ended(self):
         simulation_data = SimulationSchemas.SimulationData(
@@ -115,13 +106,7 @@ class DeviceStatusSimulation(Simulation):
             )
         )
 
-        _, channel = PikaFactory\
-            .get_new_pika_connection_and_channel()
-
-        channel.basic_publish(
-            exchange='',
+        PublisherPool.publish(
             routing_key=Topics.EVENTS.value,
             body=simulation_data.model_dump_json()
         )
-
-        channel.close()
@@ -9,15 +9,26 @@ import logging
 from device_location_simulation import DeviceLocationSimulation
 from sim_swap_simulation import SIMSwapSimulation
 from device_status_simulation import DeviceStatusSimulation
+from scheduler import SimulationScheduler
+from location_batcher import LocationBatcher
+from graph_registry import registry as GraphRegistry
+from itinerary_pool import pool as ItineraryPool
 from common.simulation.simulation_types import SimulationType
-from common.database import connections_factory as DBFactory
 
 
 class SimulationDispatcher:
 
     def __init__(self):
         self.simulations = {}
-        self.db = DBFactory.new_db_session()
+        # Load the default road graph before forking the itinerary workers,
+        # so that they share it with this process
+        GraphRegistry.get()
+        ItineraryPool.start()
+        # All the simulations share the same scheduler
+        self.scheduler = SimulationScheduler()
+        self.scheduler.start()
+        # The UEs' positions are published in batches
+        self.location_batcher = LocationBatcher(self.scheduler)
 
     def create_simulation(
         self, simulation_id, simulation_instance_id,
@@ -26,7 +37,8 @@ class SimulationDispatcher:
         if simulation_type == SimulationType.DEVICE_LOCATION:
             # Create Simulation
             simulation = DeviceLocationSimulation(
-                db=self.db,
+                scheduler=self.scheduler,
+                location_batcher=self.location_batcher,
                 simulation_id=simulation_id,
                 simulation_instance_id=simulation_instance_id,
                 child_simulation_id=child_simulation_instance_id,
@@ -36,7 +48,7 @@ class SimulationDispatcher:
         elif simulation_type == SimulationType.SIM_SWAP:
 
             simulation = SIMSwapSimulation(
-                db=self.db,
+                scheduler=self.scheduler,
                 simulation_id=simulation_id,
                 simulation_instance_id=simulation_instance_id,
                 child_simulation_id=child_simulation_instance_id,
@@ -46,7 +58,7 @@ class SimulationDispatcher:
         elif simulation_type == SimulationType.DEVICE_STATUS:
 
             simulation = DeviceStatusSimulation(
-                db=self.db,
+                scheduler=self.scheduler,
                 simulation_id=simulation_id,
                 simulation_instance_id=simulation_instance_id,
                 child_simulation_id=child_simulation_instance_id,
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 10:02:17
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 10:02:17
+import logging
+import threading
+from collections import OrderedDict
+import networkx
+import numpy as np
+import osmnx as ox
+from sklearn.neighbors import BallTree
+import config # noqa
+import constants as Constants
+from routing import Router
+
+ox.config(use_cache=True, log_console=True)
+
+
+class RoadGraph:
+
+    def __init__(self, name, graph):
+        self.name = name
+        # The graph is shared by all simulations. Thus, it is frozen to
+        # make sure that no simulation changes it
+        self.graph = networkx.freeze(graph)
+        self.size_bytes = (
+            graph.number_of_nodes() * Constants.ROAD_GRAPH_NODE_BYTES +
+            graph.number_of_edges() * Constants.ROAD_GRAPH_EDGE_BYTES
+        )
+        self._build_node_arrays()
+        self._build_nodes_tree()
+        # Length-weighted router over CSR arrays of the graph's edges
+        self.router = Router(self)
+        self.size_bytes += self.router.size_bytes
+
+    def _build_node_arrays(self):
+        # Node ids are kept sorted, so that they can be mapped to their
+        # index through a binary search. The nodes' coordinates are kept in
+        # contiguous arrays, aligned with the node ids
+        node_ids, node_x, node_y = zip(*sorted(
+            (node, data["x"], data["y"])
+            for node, data
+            in self.graph.nodes(data=True)
+        ))
+        self.node_ids = np.array(node_ids, dtype=np.int64)
+        self.node_x = np.array(node_x, dtype=np.float64)
+        self.node_y = np.array(node_y, dtype=np.float64)
+        self.size_bytes += (
+            self.node_ids.nbytes + self.node_x.nbytes + self.node_y.nbytes
+        )
+
+    def _build_nodes_tree(self):
+        # Spatial index over the nodes' coordinates, used to snap locations
+        # to their nearest node. The haversine metric requires the
+        # coordinates as (latitude, longitude), in radians
+        self.nodes_tree = BallTree(
+            np.radians(np.column_stack((self.node_y, self.node_x))),
+            metric="haversine"
+        )
+
+    def snap(self, latitudes, longitudes):
+        # Returns the id of the nearest node to each location
+        _, indexes = self.nodes_tree.query(
+            np.radians(np.column_stack((latitudes, longitudes))),
+            k=1
+        )
+        return self.node_ids[indexes[:, 0]]
+
+    def node_indexes(self, nodes):
+        return np.searchsorted(self.node_ids, nodes)
+
+    def coordinates(self, nodes):
+        # Returns an array with the x (longitude) and y (latitude) of each
+        # node
+        indexes = self.node_indexes(nodes)
+        return np.column_stack((self.node_x[indexes], self.node_y[indexes]))
+
+
+class GraphRegistry:
+
+    def __init__(
+        self, graphs_files=Constants.ROAD_GRAPHS,
+        memory_budget_mb=Constants.ROAD_GRAPHS_MEMORY_BUDGET_MB
+    ):
+        self.graphs_files = graphs_files
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        # Ordered from the least to the most recently used graph
+        self.road_graphs = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, region=None):
+        region = region or Constants.DEFAULT_ROAD_GRAPH
+
+        with self.lock:
+            road_graph = self.road_graphs.get(region)
+
+            if road_graph:
+                self.road_graphs.move_to_end(region)
+                return road_graph
+
+            if region not in self.graphs_files:
+                raise ValueError(f"Unknown road graph region '{region}'.")
+
+            logging.info(
+                f"Loading the road graph of region '{region}' from " +
+                f"{self.graphs_files[region]}..."
+            )
+
+            road_graph = RoadGraph(
+                name=region,
+                graph=ox.io.load_graphml(self.graphs_files[region])
+            )
+            self.road_graphs[region] = road_graph
+
+            logging.info(
+                f"Loaded the road graph of region '{region}' (estimated " +
+                f"size: {road_graph.size_bytes // (1024 * 1024)} MB)."
+            )
+
+            self._evict_least_recently_used_graphs()
+
+        return road_graph
+
+    def memory_usage(self):
+        return sum(
+            road_graph.size_bytes
+            for road_graph
+            in self.road_graphs.values()
+        )
+
+    def _evict_least_recently_used_graphs(self):
+        # Must be called while holding the lock. The most recently used graph
+        # is never evicted, even if it alone exceeds the memory budget.
+        # Simulations that are using an evicted graph keep their reference
+        # to it
+        while (
+            len(self.road_graphs) > 1
+            and
+            self.memory_usage() > self.memory_budget_bytes
+        ):
+            region, _ = self.road_graphs.popitem(last=False)
+            logging.info(
+                f"Evicted the road graph of region '{region}' from the " +
+                "graph registry."
+            )
+
+
+# Process-wide registry, shared by all simulations
+registry = GraphRegistry()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 10:41:53
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 10:41:53
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import config # noqa
+import constants as Constants
+
+
+class LRUCache:
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        # Ordered from the least to the most recently used entry
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+class ItineraryCache:
+
+    def __init__(
+        self, paths_cache_size=Constants.PATHS_CACHE_SIZE,
+        itineraries_cache_size=Constants.ITINERARIES_CACHE_SIZE,
+        cache_dir=Constants.ITINERARIES_CACHE_DIR
+    ):
+        # Paths are keyed by (graph id, origin node, destination node)
+        self.paths = LRUCache(paths_cache_size)
+        # Itineraries are keyed by a hash of the graph id and of the stops
+        self.itineraries = LRUCache(itineraries_cache_size)
+        self.cache_dir = cache_dir
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_path(self, graph_name, origin, destination):
+        return self.paths.get((graph_name, origin, destination))
+
+    def put_path(self, graph_name, origin, destination, path):
+        path = np.array(path, dtype=np.int64)
+        # Paths are shared by all itineraries. Thus, they must be read-only
+        path.setflags(write=False)
+        self.paths.put((graph_name, origin, destination), path)
+        return path
+
+    def itinerary_key(self, graph_name, stops):
+        stops = [[stop["latitude"], stop["longitude"]] for stop in stops]
+        return hashlib.sha256(
+            json.dumps([graph_name, stops]).encode()
+        ).hexdigest()
+
+    def get_itinerary(self, graph_name, stops):
+        key = self.itinerary_key(graph_name, stops)
+        itinerary = self.itineraries.get(key)
+
+        if itinerary is None and self.cache_dir:
+            itinerary = self._load_itinerary(key)
+            if itinerary is not None:
+                self.itineraries.put(key, itinerary)
+
+        return itinerary
+
+    def put_itinerary(self, graph_name, stops, itinerary):
+        # Itineraries are shared by all UEs. Thus, they must be read-only
+        itinerary.setflags(write=False)
+        key = self.itinerary_key(graph_name, stops)
+        self.itineraries.put(key, itinerary)
+
+        if self.cache_dir:
+            self._store_itinerary(key, itinerary)
+
+        return itinerary
+
+    def stats(self):
+        return {
+            "paths": self.paths.stats(),
+            "itineraries": self.itineraries.stats()
+        }
+
+    def _itinerary_file(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def _load_itinerary(self, key):
+        try:
+            itinerary = np.load(self._itinerary_file(key))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.error(
+                f"Could not load the cached itinerary {key}. Reason: {e}"
+            )
+            return None
+
+        itinerary.setflags(write=False)
+        return itinerary
+
+    def _store_itinerary(self, key, itinerary):
+        file = self._itinerary_file(key)
+        if os.path.exists(file):
+            return
+        # Write to a temporary file first, so that other processes never
+        # read a partially written itinerary
+        tmp_file = f"{file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                np.save(f, itinerary)
+            os.replace(tmp_file, file)
+        except Exception as e:
+            logging.error(
+                f"Could not store the itinerary {key} in the disk cache. " +
+                f"Reason: {e}"
+            )
+
+
+# Process-wide cache, shared by all simulations
+cache = ItineraryCache()
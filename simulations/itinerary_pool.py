@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 11:58:12
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 11:58:12
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+import numpy as np
+import config # noqa
+import constants as Constants
+from graph_registry import registry as GraphRegistry
+from itinerary_cache import cache as ItineraryCache
+
+
+def create_itinerary(road_graph, stops):
+
+    all_path_nodes = []
+
+    if not stops:
+        return np.empty((0, 2))
+
+    # Snap all the stops to their nearest nodes at once
+    stops_nodes = road_graph.snap(
+        [stop["latitude"] for stop in stops],
+        [stop["longitude"] for stop in stops]
+    ).tolist()
+
+    # With a single stop there is no path to compute. The UE stays at it
+    if len(stops_nodes) < 2:
+        return road_graph.coordinates(stops_nodes)
+
+    # For every location in the route compute the path from the previous
+    # location to it
+    for origin, destination in zip(stops_nodes[:-1], stops_nodes[1:]):
+        # Compute the nodes in the path
+        path_nodes = ItineraryCache.get_path(
+            road_graph.name, origin, destination
+        )
+        if path_nodes is None:
+            path_nodes = ItineraryCache.put_path(
+                road_graph.name, origin, destination,
+                road_graph.router.shortest_path(origin, destination)
+            )
+
+        # save
+        all_path_nodes.append(path_nodes)
+
+    # Array with the x (longitude) and y (latitude) of each itinerary's node
+    return road_graph.coordinates(np.concatenate(all_path_nodes))
+
+
+def compute_itinerary(region, stops):
+    # Runs in the worker processes. Each worker keeps its own itinerary
+    # cache, and reuses the graphs loaded before it was forked
+    itinerary = ItineraryCache.get_itinerary(region, stops)
+    if itinerary is not None:
+        return itinerary
+
+    return ItineraryCache.put_itinerary(
+        region,
+        stops,
+        create_itinerary(GraphRegistry.get(region), stops)
+    )
+
+
+class ItineraryPool:
+    # Computes the itineraries in worker processes, so that the simulations
+    # orchestrator is not blocked while they are computed. The workers are
+    # forked, thus sharing the already loaded road graphs with the parent
+    # process
+
+    def __init__(self, workers=Constants.ITINERARY_WORKERS):
+        self.workers = workers
+        self.executor = None
+
+    def start(self):
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("fork")
+        )
+        # All the workers are forked on the first submission. Do it now,
+        # before the process starts other threads
+        self.executor.submit(int).result()
+        logging.info(
+            f"Itinerary pool started with {self.workers} workers."
+        )
+
+    def stop(self):
+        if self.executor:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def submit(self, region, stops):
+        # Returns a future with the itinerary's coordinates
+        itinerary = ItineraryCache.get_itinerary(region, stops)
+
+        if itinerary is not None:
+            future = Future()
+            future.set_result(itinerary)
+            return future
+
+        if not self.executor:
+            # The pool was not started. Compute the itinerary in this process
+            future = Future()
+            try:
+                future.set_result(compute_itinerary(region, stops))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        future = self.executor.submit(compute_itinerary, region, stops)
+        future.add_done_callback(
+            lambda future: self._cache_itinerary(region, stops, future)
+        )
+        return future
+
+    def _cache_itinerary(self, region, stops, future):
+        if future.cancelled() or future.exception():
+            return
+        ItineraryCache.put_itinerary(region, stops, future.result())
+
+
+# Process-wide pool, shared by all simulations
+pool = ItineraryPool()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 14:37:20
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 14:37:20
+import logging
+import threading
+import pika
+import config # noqa
+import constants as Constants
+from common.simulation.simulation_types import SimulationType
+from common.message_broker import schemas as SimulationSchemas
+from common.message_broker import encoding as Encoding
+from common.message_broker import constants as MessageBrokerConstants
+from common.message_broker.publisher_pool import (
+    publisher_pool as PublisherPool
+)
+
+
+class LocationBatcher:
+    # Gathers the positions advertised by the UEs of each simulation
+    # instance and publishes them as a single batch message
+
+    def __init__(
+        self, scheduler, batch_size=Constants.LOCATION_BATCH_SIZE,
+        max_latency=Constants.LOCATION_BATCH_MAX_LATENCY
+    ):
+        self.scheduler = scheduler
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        # Pending positions and flush events, by (simulation id, simulation
+        # instance id)
+        self.batches = {}
+        self.flush_events = {}
+        self.lock = threading.Lock()
+
+    def add(self, simulation, position):
+        key = (simulation.simulation_id, simulation.simulation_instance_id)
+
+        with self.lock:
+            batch = self.batches.setdefault(key, [])
+            batch.append(position)
+
+            if len(batch) < self.batch_size:
+                # Make sure that the first position of the batch does not
+                # wait more than the maximum latency
+                if key not in self.flush_events:
+                    self.flush_events[key] = self.scheduler.schedule(
+                        self.max_latency,
+                        lambda: self.flush(*key)
+                    )
+                return
+
+            positions = self._take_batch(key)
+
+        self._publish(key, positions)
+
+    def flush(self, simulation_id, simulation_instance_id):
+        key = (simulation_id, simulation_instance_id)
+
+        with self.lock:
+            positions = self._take_batch(key)
+
+        if positions:
+            self._publish(key, positions)
+
+    def _take_batch(self, key):
+        # Must be called while holding the lock
+        flush_event = self.flush_events.pop(key, None)
+        if flush_event:
+            flush_event.cancel()
+        return self.batches.pop(key, [])
+
+    def _publish(self, key, positions):
+        simulation_id, simulation_instance_id = key
+
+        # The child simulation of each position is set in the position
+        # itself
+        simulation_data = SimulationSchemas.SimulationData(
+            simulation_id=simulation_id,
+            simulation_instance_id=simulation_instance_id,
+            child_simulation_instance_id=-1,
+            simulation_type=SimulationType.DEVICE_LOCATION,
+            data=SimulationSchemas.DeviceLocationBatchSimulationData(
+                positions=positions
+            )
+        )
+        body, content_type = Encoding.encode(simulation_data)
+        properties = pika.BasicProperties(content_type=content_type)
+
+        logging.debug(
+            f"Publishing a batch of {len(positions)} UE positions of " +
+            f"Simulation {simulation_id}, Simulation Instance " +
+            f"{simulation_instance_id}."
+        )
+
+        try:
+            # Published once to the data exchange, which delivers it to the
+            # handlers and to the events module
+            PublisherPool.publish(
+                exchange=MessageBrokerConstants.DATA_EXCHANGE,
+                routing_key=SimulationType.DEVICE_LOCATION.value,
+                body=body,
+                properties=properties
+            )
+        except Exception as e:
+            logging.error(
+                f"Could not publish a batch of {len(positions)} UE " +
+                f"positions of Simulation Instance {simulation_instance_id}" +
+                f". Reason: {e}"
+            )
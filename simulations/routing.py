@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 11:20:36
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 11:20:36
+import heapq
+import math
+import networkx
+import numpy as np
+import config # noqa
+import constants as Constants
+
+EARTH_RADIUS_METERS = 6371008.8
+
+
+def haversine_distances(latitudes, longitudes, latitude, longitude):
+    # Great-circle distance, in meters, between the locations. Arrays are
+    # compared element-wise and scalars are broadcast
+    latitudes = np.radians(latitudes)
+    longitudes = np.radians(longitudes)
+    latitude = np.radians(latitude)
+    longitude = np.radians(longitude)
+
+    a = (
+        np.sin((latitudes - latitude) / 2) ** 2 +
+        np.cos(latitudes) * np.cos(latitude) *
+        np.sin((longitudes - longitude) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(a))
+
+
+class Router:
+    # Computes the shortest paths, weighted by the edges' length, of a road
+    # graph. The graph is stored as two CSR adjacency structures (one with
+    # the outgoing and other with the incoming edges of each node), which
+    # are searched through a bidirectional A*, guided by the haversine
+    # distance to the origin and to the destination
+
+    def __init__(self, road_graph):
+        self.road_graph = road_graph
+
+        origins, destinations, lengths = self._edges_arrays()
+        self.forward = self._build_csr(origins, destinations, lengths)
+        self.reverse = self._build_csr(destinations, origins, lengths)
+
+        # The search loop is faster when iterating over python lists than
+        # over numpy scalars
+        self.forward_lists = [array.tolist() for array in self.forward]
+        self.reverse_lists = [array.tolist() for array in self.reverse]
+
+        self.size_bytes = sum(
+            array.nbytes
+            for array
+            in self.forward + self.reverse
+        ) * 2
+
+    def _edges_arrays(self):
+        edges = [
+            (origin, destination, data.get("length", 0))
+            for origin, destination, data
+            in self.road_graph.graph.edges(data=True)
+        ]
+        if not edges:
+            return (
+                np.array([], dtype=np.int64),
+                np.array([], dtype=np.int64),
+                np.array([], dtype=np.float64)
+            )
+
+        origins, destinations, lengths = zip(*edges)
+        return (
+            self.road_graph.node_indexes(origins),
+            self.road_graph.node_indexes(destinations),
+            np.array(lengths, dtype=np.float64)
+        )
+
+    def _build_csr(self, origins, destinations, lengths):
+        # Parallel edges are reduced to the shortest one
+        order = np.lexsort((lengths, destinations, origins))
+        origins = origins[order]
+        destinations = destinations[order]
+        lengths = lengths[order]
+
+        unique = np.ones(len(origins), dtype=bool)
+        unique[1:] = (
+            (origins[1:] != origins[:-1]) |
+            (destinations[1:] != destinations[:-1])
+        )
+        origins = origins[unique]
+        destinations = destinations[unique]
+        lengths = lengths[unique]
+
+        indptr = np.zeros(len(self.road_graph.node_ids) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(origins, minlength=len(self.road_graph.node_ids)),
+            out=indptr[1:]
+        )
+        return indptr, destinations, lengths
+
+    def _potentials(self, origin, destination):
+        # Averaged potentials, which keep the forward and the reverse
+        # searches consistent with each other. The forward search uses
+        # potentials and the reverse search uses their symmetric
+        node_y = self.road_graph.node_y
+        node_x = self.road_graph.node_x
+        to_destination = haversine_distances(
+            node_y, node_x, node_y[destination], node_x[destination]
+        )
+        to_origin = haversine_distances(
+            node_y, node_x, node_y[origin], node_x[origin]
+        )
+        return (
+            (to_destination - to_origin) / 2 *
+            Constants.ROUTING_HEURISTIC_SCALE
+        ).tolist()
+
+    def shortest_path(self, origin_node, destination_node):
+        origin, destination = self.road_graph.node_indexes(
+            [origin_node, destination_node]
+        ).tolist()
+
+        if origin == destination:
+            return [origin_node]
+
+        potentials = self._potentials(origin, destination)
+
+        # Each search keeps the distances, the parent of each reached node,
+        # the set of settled nodes and a heap of (key, node)
+        distances = ({origin: 0.0}, {destination: 0.0})
+        parents = ({origin: None}, {destination: None})
+        settled = (set(), set())
+        heaps = (
+            [(potentials[origin], origin)],
+            [(-potentials[destination], destination)]
+        )
+        adjacencies = (self.forward_lists, self.reverse_lists)
+        # Sign of the potentials used by each search
+        signs = (1, -1)
+
+        best_length = math.inf
+        meeting_node = None
+
+        while heaps[0] and heaps[1]:
+            # Stop when no shorter path can still be found
+            if heaps[0][0][0] + heaps[1][0][0] >= best_length:
+                break
+
+            # Expand the search with the smallest frontier
+            direction = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            _, node = heapq.heappop(heaps[direction])
+            if node in settled[direction]:
+                continue
+            settled[direction].add(node)
+
+            distance = distances[direction][node]
+            other_distances = distances[1 - direction]
+            indptr, indices, lengths = adjacencies[direction]
+            sign = signs[direction]
+
+            for i in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[i]
+                neighbor_distance = distance + lengths[i]
+
+                if neighbor_distance >= distances[direction].get(
+                    neighbor, math.inf
+                ):
+                    continue
+
+                distances[direction][neighbor] = neighbor_distance
+                parents[direction][neighbor] = node
+                heapq.heappush(
+                    heaps[direction],
+                    (neighbor_distance + sign * potentials[neighbor], neighbor)
+                )
+
+                if neighbor in other_distances:
+                    length = neighbor_distance + other_distances[neighbor]
+                    if length < best_length:
+                        best_length = length
+                        meeting_node = neighbor
+
+        if meeting_node is None:
+            raise networkx.NetworkXNoPath(
+                f"No path between nodes {origin_node} and {destination_node}."
+            )
+
+        return self.road_graph.node_ids[
+            self._build_path(parents, meeting_node)
+        ].tolist()
+
+    def _build_path(self, parents, meeting_node):
+        path = []
+        node = meeting_node
+        while node is not None:
+            path.append(node)
+            node = parents[0][node]
+        path.reverse()
+
+        node = parents[1][meeting_node]
+        while node is not None:
+            path.append(node)
+            node = parents[1][node]
+
+        return path
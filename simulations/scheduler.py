@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 09:14:02
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 09:14:02
+import heapq
+import itertools
+import logging
+import threading
+import config # noqa
+import constants as Constants
+from common.simulation.clock import clock as SimulationClock
+
+
+class ScheduledEvent:
+
+    __slots__ = ("due", "callback", "cancelled")
+
+    def __init__(self, due, callback):
+        self.due = due
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class SimulationScheduler:
+    # All the UEs of all the simulations share this scheduler. Instead of
+    # having one sleeping thread per UE, each UE registers its next due
+    # event in a timer heap and a small, fixed, number of workers fire them
+
+    def __init__(
+        self, workers=Constants.SCHEDULER_WORKERS, clock=SimulationClock
+    ):
+        self.workers = workers
+        # Events are scheduled in simulated time
+        self.clock = clock
+        self.events = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.threads = []
+        self.running = False
+        # Number of callbacks being run by the workers
+        self.running_callbacks = 0
+
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+            self.threads = [
+                threading.Thread(
+                    target=self._run,
+                    name=f"simulations-scheduler-{i}",
+                    daemon=True
+                )
+                for i
+                in range(self.workers)
+            ]
+
+        for thread in self.threads:
+            thread.start()
+
+        logging.info(
+            f"Simulations scheduler started with {self.workers} workers."
+        )
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+        for thread in self.threads:
+            thread.join()
+
+    def now(self):
+        return self.clock.monotonic()
+
+    def schedule(self, delay, callback):
+        return self.schedule_at(self.now() + max(delay, 0), callback)
+
+    def schedule_at(self, due, callback):
+        event = ScheduledEvent(due, callback)
+
+        with self.condition:
+            heapq.heappush(
+                self.events,
+                (event.due, next(self.sequence), event)
+            )
+            # Only wake up a worker if this is now the earliest event
+            if self.events[0][2] is event:
+                self.condition.notify()
+
+        return event
+
+    def _next_due_event(self):
+        # Must be called while holding the condition
+        while self.running:
+            if not self.events:
+                self.condition.wait()
+                continue
+
+            due, _, event = self.events[0]
+
+            if event.cancelled:
+                heapq.heappop(self.events)
+                continue
+
+            timeout = due - self.now()
+            if timeout <= 0:
+                heapq.heappop(self.events)
+                self.running_callbacks += 1
+                return event
+
+            if self.clock.max_speed:
+                # In the max speed mode, the clock jumps straight to the
+                # event's due time. The running callbacks may still schedule
+                # earlier events, so it only jumps once they are all done
+                if self.running_callbacks:
+                    self.condition.wait()
+                    continue
+                heapq.heappop(self.events)
+                self.clock.advance_to(due)
+                self.running_callbacks += 1
+                return event
+
+            self.condition.wait(self.clock.real_delay(timeout))
+
+        return None
+
+    def _run(self):
+        while True:
+            with self.condition:
+                event = self._next_due_event()
+                if not event:
+                    return
+                # Let another worker keep an eye on the next due event
+                if self.events:
+                    self.condition.notify()
+
+            try:
+                event.callback()
+            except Exception as e:
+                logging.error(
+                    f"Error while processing a scheduled event. Reason: {e}"
+                )
+            finally:
+                with self.condition:
+                    self.running_callbacks -= 1
+                    # Let the workers waiting for the running callbacks
+                    # advance the clock
+                    if not self.running_callbacks:
+                        self.condition.notify_all()
@@ -3,35 +3,35 @@
 # @Date:   2023-12-06 22:11:26
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2023-12-27 16:49:25
-import threading
 import config # noqa
 from aux.ue_sim_swap import UESIMSwap
 from base_simulation import Simulation
 from common.simulation.simulation_types import SimulationType
-from common.message_broker import connections_factory as PikaFactory
 from common.database import crud
+from common.database import connections_factory as DBFactory
 
 
 class SIMSwapSimulation(Simulation):
 
-    ue_threads = []
     sim_swap_ues = []
     sim_swap_ues_count = None
     simulation_type = SimulationType.SIM_SWAP
 
     def __init__(
-        self, db, simulation_id, simulation_instance_id, child_simulation_id,
-        simulation_payload
+        self, scheduler, simulation_id, simulation_instance_id,
+        child_simulation_id, simulation_payload
     ):
         # Initialize super
         super().__init__(
-            db, simulation_id, simulation_instance_id, child_simulation_id,
-            simulation_payload
+            scheduler, simulation_id, simulation_instance_id,
+            child_simulation_id, simulation_payload
         )
 
     def signal_that_ue_has_stopped(self):
-        self.sim_swap_ues_count -= 1
-        if self.sim_swap_ues_count == 0:
+        with self.lock:
+            self.sim_swap_ues_count -= 1
+            simulation_has_ended = self.sim_swap_ues_count == 0
+        if simulation_has_ended:
             self.signal_that_simulation_ended()
 
     def start_simulation(self):
@@ -45,50 +45,39 @@ class SIMSwapSimulation(Simulation):
         for ue_instance in self.simulation_payload["devices"]:
 
             # Get Root UE
-            ue = crud.get_simulated_device_id_from_simulated_device_instance(
-                db=self.db,
-                simulated_device_instance_id=ue_instance
-            )
-
-            connection, channel = PikaFactory\
-                .get_new_pika_connection_and_channel()
+            with DBFactory.session_scope() as db:
+                ue = crud\
+                    .get_simulated_device_id_from_simulated_device_instance(
+                        db=db,
+                        simulated_device_instance_id=ue_instance
+                    )
 
             self.sim_swap_ues.append(
                 UESIMSwap(
                     simulation=self,
+                    scheduler=self.scheduler,
                     ue=ue,
                     ue_instance=ue_instance,
                     timestamps_for_swaps_seconds=self.simulation_payload.get(
                         "timestamps_for_swaps_seconds"
-                    ),
-                    message_queue_connection=connection,
-                    message_queue_channel=channel
+                    )
                 )
             )
 
-        # Todo: Using threads is far from being the best approach to deal 
-        # Todo: with this
-        # Todo: This threading appraoch must be replaced by a more resilient 
-        # Todo: one
+        self.sim_swap_ues_count = len(self.sim_swap_ues)
 
-        # Create threads
-        self.ue_threads = [
-            threading.Thread(target=ue.start_sim_swapping)
-            for ue
-            in self.sim_swap_ues
-        ]
-        self.sim_swap_ues_count = len(self.ue_threads)
+        # Without UEs, no UE will ever signal that it has stopped. Thus, the
+        # simulation ends right away
+        if not self.sim_swap_ues:
+            self.signal_that_simulation_ended()
+            return
 
-        # Start the threads
-        for thread in self.ue_threads:
-            thread.start()
+        # Register the UEs in the scheduler
+        for ue in self.sim_swap_ues:
+            ue.start_sim_swapping()
 
     def stop_simulation(self):
-        # Stop all moving UEs
+        # Stop all UEs. Each stopped UE signals it to this simulation, and
+        # the last one to stop will conclude the simulation
         for sim_swap_ue in self.sim_swap_ues:
             sim_swap_ue.stop()
-        # Wait for all threads to finish
-        for thread in self.ue_threads:
-            thread.join()
-        # Signal that the simulation has ended
-        self.signal_that_simulation_ended()
@@ -3,18 +3,25 @@
 # @Date:   2023-12-07 11:17:37
 # @Last Modified by:   Rafael Direito
 # @Last Modified time: 2023-12-27 16:50:17
-import json
 import sys
 import logging
 import config # noqa
 from dispatcher import SimulationDispatcher
 from common.message_broker import connections_factory as PikaFactory
 from common.message_broker.topics import Topics
+from common.message_broker import encoding as Encoding
 from common.message_broker import schemas as SimulationSchemas
 from common.simulation.simulation_operations import SimulationOperation
+from common.simulation import constants as ClockConstants
+from common.simulation.clock import clock as SimulationClock
 
 
 def main():
+    # Only the simulations run at max speed, since the time is advanced by
+    # their scheduler
+    if ClockConstants.SIMULATION_CLOCK_MAX_SPEED:
+        SimulationClock.enable_max_speed()
+
     # Start RabbitMQ Consumer Connection
     _, consumer_channel = PikaFactory.get_new_pika_connection_and_channel()
 
@@ -25,7 +32,7 @@ def main():
 
         try:
             simulation = SimulationSchemas\
-                .SimulationAction(**json.loads(body))
+                .SimulationAction(**Encoding.decode(body, properties))
 
             logging.debug(f" [x] Received {simulation}")
 
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 20:41:17
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 20:41:17
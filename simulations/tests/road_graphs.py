@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 20:41:17
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 20:41:17
+import random
+import networkx
+import config # noqa
+from graph_registry import RoadGraph
+from routing import haversine_distances
+
+GRID_SIZE = 8
+GRID_STEP_DEGREES = 0.001
+GRID_LATITUDE = 40.63
+GRID_LONGITUDE = -8.65
+
+# Node not connected to any other node of the grid
+ISOLATED_NODE = 10 * GRID_SIZE ** 2 + 10
+
+
+def grid_node(i, j):
+    # The node ids are not contiguous, as in the OSM graphs
+    return 10 * (i * GRID_SIZE + j) + 10
+
+
+def grid_road_graph(name, seed=0):
+    # Two-way grid of streets, around Aveiro. The edges' length is longer
+    # than the straight line between their nodes by a random factor, so
+    # that the shortest path depends on the edges' length and not only on
+    # the number of hops
+    rng = random.Random(seed)
+    graph = networkx.MultiDiGraph()
+
+    for i in range(GRID_SIZE):
+        for j in range(GRID_SIZE):
+            graph.add_node(
+                grid_node(i, j),
+                y=GRID_LATITUDE + i * GRID_STEP_DEGREES,
+                x=GRID_LONGITUDE + j * GRID_STEP_DEGREES
+            )
+    graph.add_node(ISOLATED_NODE, y=GRID_LATITUDE - 0.01, x=GRID_LONGITUDE)
+
+    for i in range(GRID_SIZE):
+        for j in range(GRID_SIZE):
+            for di, dj in ((0, 1), (1, 0)):
+                if i + di >= GRID_SIZE or j + dj >= GRID_SIZE:
+                    continue
+                origin = grid_node(i, j)
+                destination = grid_node(i + di, j + dj)
+                distance = float(haversine_distances(
+                    graph.nodes[origin]["y"], graph.nodes[origin]["x"],
+                    graph.nodes[destination]["y"],
+                    graph.nodes[destination]["x"]
+                ))
+                for u, v in ((origin, destination), (destination, origin)):
+                    graph.add_edge(
+                        u, v, length=distance * rng.uniform(1, 3)
+                    )
+
+    return RoadGraph(name=name, graph=graph)
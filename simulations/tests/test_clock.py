@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 22:10:26
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 22:10:26
+
+from datetime import datetime, timedelta
+import pytest
+import config # noqa
+from common.simulation.clock import SimulationClock
+
+
+def test_clock_speed_requires_an_epoch():
+    with pytest.raises(ValueError):
+        SimulationClock(speed=10)
+
+
+def test_clock_runs_faster_than_the_wall_clock():
+    clock = SimulationClock(speed=3600, epoch="2026-10-18T00:00:00Z")
+
+    wall_clock_now = datetime.utcnow()
+    elapsed_hours = (clock.utcnow() - datetime(2026, 10, 18)) \
+        .total_seconds() / 3600
+    wall_clock_elapsed_seconds = (
+        wall_clock_now - datetime(2026, 10, 18)
+    ).total_seconds()
+
+    # One simulated hour per wall clock second
+    assert elapsed_hours == pytest.approx(wall_clock_elapsed_seconds, abs=1)
+
+
+def test_clock_only_advances_in_max_speed_mode_when_enabled():
+    clock = SimulationClock(speed=1)
+    clock.advance_to(clock.monotonic() + 3600)
+
+    # Without the max speed mode, the clock follows the wall clock
+    assert clock.utcnow() - datetime.utcnow() < timedelta(minutes=1)
+
+    clock.enable_max_speed()
+    before = clock.utcnow()
+    clock.advance_to(clock.monotonic() + 3600)
+
+    assert (clock.utcnow() - before).total_seconds() == 3600
+    assert clock.real_delay(60) == 0
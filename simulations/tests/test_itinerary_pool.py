@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 20:41:17
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 20:41:17
+
+import pytest
+import config # noqa
+from itinerary_pool import create_itinerary
+from simulations.tests.road_graphs import (
+    grid_road_graph,
+    grid_node,
+    GRID_SIZE
+)
+
+
+@pytest.fixture(scope="module")
+def road_graph():
+    return grid_road_graph("itinerary-pool-grid")
+
+
+def stop_at(road_graph, node):
+    i = road_graph.node_indexes([node])[0]
+    return {
+        "latitude": float(road_graph.node_y[i]),
+        "longitude": float(road_graph.node_x[i])
+    }
+
+
+def test_itinerary_goes_through_all_stops(road_graph):
+    stops_nodes = [
+        grid_node(0, 0),
+        grid_node(GRID_SIZE - 1, GRID_SIZE - 1),
+        grid_node(0, GRID_SIZE - 1)
+    ]
+    itinerary = create_itinerary(
+        road_graph, [stop_at(road_graph, node) for node in stops_nodes]
+    )
+
+    # The itinerary starts at the first stop, goes through the second one
+    # and ends at the last one
+    points = [
+        [stop["longitude"], stop["latitude"]]
+        for stop in (stop_at(road_graph, node) for node in stops_nodes)
+    ]
+    assert itinerary.shape[1] == 2
+    assert itinerary[0].tolist() == points[0]
+    assert points[1] in itinerary.tolist()
+    assert itinerary[-1].tolist() == points[2]
+
+
+@pytest.mark.parametrize('stops_count', [0, 1])
+def test_itinerary_with_less_than_two_stops(road_graph, stops_count):
+    stop = stop_at(road_graph, grid_node(2, 3))
+    # Slightly away from the node, so that it has to be snapped
+    stops = [
+        {
+            "latitude": stop["latitude"] + 0.00001,
+            "longitude": stop["longitude"] - 0.00001
+        }
+    ][:stops_count]
+
+    itinerary = create_itinerary(road_graph, stops)
+
+    assert itinerary.shape == (stops_count, 2)
+    if stops_count:
+        # The UE stays at the stop's nearest node
+        assert itinerary.tolist() == [[stop["longitude"], stop["latitude"]]]
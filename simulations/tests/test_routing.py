@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 20:58:40
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 20:58:40
+
+import itertools
+import networkx
+import pytest
+import config # noqa
+from simulations.tests.road_graphs import (
+    grid_road_graph,
+    grid_node,
+    GRID_SIZE,
+    ISOLATED_NODE
+)
+
+
+@pytest.fixture(scope="module")
+def road_graph():
+    return grid_road_graph("routing-grid")
+
+
+def path_length(graph, path):
+    return sum(
+        min(data["length"] for data in graph[origin][destination].values())
+        for origin, destination in zip(path[:-1], path[1:])
+    )
+
+
+NODES = [
+    grid_node(i, j)
+    for i, j in itertools.product(
+        (0, GRID_SIZE // 2, GRID_SIZE - 1), (0, 3, GRID_SIZE - 1)
+    )
+]
+
+
+@pytest.mark.parametrize(
+    'origin, destination',
+    [
+        (origin, destination)
+        for origin, destination in itertools.permutations(NODES, 2)
+    ]
+)
+def test_shortest_path_length_matches_networkx(
+    road_graph, origin, destination
+):
+    path = road_graph.router.shortest_path(origin, destination)
+    expected_path = networkx.shortest_path(
+        road_graph.graph, origin, destination, weight="length"
+    )
+
+    assert path[0] == origin
+    assert path[-1] == destination
+    # Every consecutive pair of nodes must be an edge of the graph
+    assert all(
+        road_graph.graph.has_edge(u, v) for u, v in zip(path[:-1], path[1:])
+    )
+    assert path_length(road_graph.graph, path) == pytest.approx(
+        path_length(road_graph.graph, expected_path)
+    )
+
+
+def test_shortest_path_to_the_origin(road_graph):
+    node = grid_node(2, 5)
+    assert road_graph.router.shortest_path(node, node) == [node]
+
+
+@pytest.mark.parametrize(
+    'origin, destination',
+    [
+        (grid_node(0, 0), ISOLATED_NODE),
+        (ISOLATED_NODE, grid_node(0, 0)),
+    ]
+)
+def test_shortest_path_between_unreachable_nodes(
+    road_graph, origin, destination
+):
+    with pytest.raises(networkx.NetworkXNoPath):
+        road_graph.router.shortest_path(origin, destination)
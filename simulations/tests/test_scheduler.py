@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 21:06:12
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 21:06:12
+
+import contextlib
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+import pytest
+import config # noqa
+import base_simulation
+from scheduler import SimulationScheduler
+from sim_swap_simulation import SIMSwapSimulation
+from device_status_simulation import DeviceStatusSimulation
+from device_location_simulation import DeviceLocationSimulation
+from common.database import crud
+from common.message_broker.publisher_pool import (
+    publisher_pool as PublisherPool
+)
+
+TIMEOUT = 5
+
+
+class FakeClock:
+    # Max speed clock, whose time only moves forward when the scheduler
+    # advances it to its next due event
+
+    def __init__(self, max_speed=True):
+        self.max_speed = max_speed
+        self.elapsed = 0
+
+    def monotonic(self):
+        return self.elapsed
+
+    def real_delay(self, delay):
+        return 0 if self.max_speed else delay
+
+    def advance_to(self, monotonic_time):
+        self.elapsed = max(self.elapsed, monotonic_time)
+
+
+class FakeLocationBatcher:
+
+    def flush(self, simulation_id, simulation_instance_id):
+        pass
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = SimulationScheduler(workers=1, clock=FakeClock())
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+
+
+@pytest.fixture
+def ended_simulations(monkeypatch):
+    ended_simulations = []
+
+    monkeypatch.setattr(
+        base_simulation.DBFactory, "session_scope", contextlib.nullcontext
+    )
+    monkeypatch.setattr(
+        crud, "update_child_simulation_start_timestamp",
+        lambda db, child_simulation_id, start_timestamp: None
+    )
+    monkeypatch.setattr(
+        crud, "update_child_simulation_end_timestamp",
+        lambda db, child_simulation_id, end_timestamp:
+            ended_simulations.append(child_simulation_id)
+    )
+    monkeypatch.setattr(
+        crud, "get_simulated_device_id_from_simulated_device_instance",
+        lambda db, simulated_device_instance_id: simulated_device_instance_id
+    )
+    monkeypatch.setattr(PublisherPool, "publish", lambda **kwargs: None)
+
+    return ended_simulations
+
+
+def wait_for(scheduler):
+    # Events are fired in order. Thus, once a later event is fired, all the
+    # previous ones have been fired too
+    fired = threading.Event()
+    scheduler.schedule(10 ** 6, fired.set)
+    assert fired.wait(TIMEOUT)
+
+
+def test_events_are_fired_in_order(scheduler):
+    fired = []
+
+    for delay in [5, 1, 3, 2, 4, 3]:
+        scheduler.schedule(
+            delay, lambda delay=delay: fired.append(delay)
+        )
+
+    wait_for(scheduler)
+
+    assert fired == [1, 2, 3, 3, 4, 5]
+    assert scheduler.now() == 10 ** 6
+
+
+def test_events_with_a_past_due_time_are_fired(scheduler):
+    fired = []
+
+    scheduler.clock.advance_to(10)
+    scheduler.schedule_at(5, lambda: fired.append(5))
+    scheduler.schedule(-1, lambda: fired.append(-1))
+
+    wait_for(scheduler)
+
+    assert fired == [5, -1]
+
+
+def test_clock_waits_for_the_running_callbacks_in_max_speed_mode():
+    fired = []
+    scheduler = SimulationScheduler(workers=4, clock=FakeClock())
+
+    def slow_callback():
+        fired.append(scheduler.now())
+        # Meanwhile, the other workers could already advance the clock
+        time.sleep(0.1)
+        scheduler.schedule(1, lambda: fired.append(scheduler.now()))
+
+    scheduler.schedule(1, slow_callback)
+    scheduler.schedule(5, lambda: fired.append(scheduler.now()))
+    scheduler.start()
+    wait_for(scheduler)
+    scheduler.stop()
+
+    assert fired == [1, 2, 5]
+
+
+def test_cancelled_events_are_not_fired(scheduler):
+    fired = []
+
+    events = [
+        scheduler.schedule(delay, lambda delay=delay: fired.append(delay))
+        for delay in [1, 2, 3]
+    ]
+    events[1].cancel()
+
+    wait_for(scheduler)
+
+    assert fired == [1, 3]
+
+
+def test_failing_events_do_not_stop_the_scheduler(scheduler):
+    fired = []
+
+    scheduler.schedule(1, lambda: 1 / 0)
+    scheduler.schedule(2, lambda: fired.append(2))
+
+    wait_for(scheduler)
+
+    assert fired == [2]
+
+
+def test_stopped_scheduler_does_not_fire_pending_events():
+    fired = []
+    # In real time, the event would only be due in one hour
+    scheduler = SimulationScheduler(
+        workers=2, clock=FakeClock(max_speed=False)
+    )
+    scheduler.start()
+    scheduler.schedule(3600, lambda: fired.append(3600))
+
+    scheduler.stop()
+
+    assert not any(thread.is_alive() for thread in scheduler.threads)
+    assert fired == []
+
+
+def test_simulation_ends_after_all_its_ues_stop(
+    scheduler, ended_simulations
+):
+    simulation = SIMSwapSimulation(
+        scheduler=scheduler,
+        simulation_id=1,
+        simulation_instance_id=1,
+        child_simulation_id=1,
+        simulation_payload={
+            "devices": [1, 2],
+            "timestamps_for_swaps_seconds": [10, 20]
+        }
+    )
+
+    simulation.start_simulation()
+    wait_for(scheduler)
+
+    assert ended_simulations == [1]
+
+
+def test_stopped_simulation_ends(scheduler, ended_simulations):
+    simulation = SIMSwapSimulation(
+        scheduler=scheduler,
+        simulation_id=1,
+        simulation_instance_id=1,
+        child_simulation_id=1,
+        simulation_payload={
+            "devices": [1, 2],
+            "timestamps_for_swaps_seconds": [10 ** 7]
+        }
+    )
+
+    simulation.start_simulation()
+    simulation.stop_simulation()
+
+    assert ended_simulations == [1]
+
+
+@pytest.mark.parametrize(
+    'simulation_class, simulation_payload',
+    [
+        (
+            SIMSwapSimulation,
+            {"devices": [], "timestamps_for_swaps_seconds": [10]}
+        ),
+        (
+            DeviceStatusSimulation,
+            {"devices": [], "device_status_updates": []}
+        ),
+    ]
+)
+def test_simulation_without_ues_ends(
+    scheduler, ended_simulations, simulation_class, simulation_payload
+):
+    simulation = simulation_class(
+        scheduler=scheduler,
+        simulation_id=1,
+        simulation_instance_id=1,
+        child_simulation_id=1,
+        simulation_payload=simulation_payload
+    )
+
+    simulation.start_simulation()
+
+    assert ended_simulations == [1]
+
+
+def test_device_location_simulation_without_ues_ends(
+    scheduler, ended_simulations
+):
+    simulation = DeviceLocationSimulation(
+        scheduler=scheduler,
+        location_batcher=FakeLocationBatcher(),
+        simulation_id=1,
+        simulation_instance_id=1,
+        child_simulation_id=1,
+        simulation_payload={"devices": [], "duration": 10}
+    )
+    simulation.itineraries = []
+    itinerary = Future()
+    itinerary.set_result(np.array([[-8.65, 40.63], [-8.64, 40.63]]))
+
+    simulation._start_moving_ues(itinerary)
+
+    assert ended_simulations == [1]
+
+    # Stopping an ended simulation does not end it again
+    simulation.stop_simulation()
+
+    assert ended_simulations == [1]
+
+
+def test_device_location_simulation_with_an_empty_itinerary_ends(
+    scheduler, ended_simulations
+):
+    simulation = DeviceLocationSimulation(
+        scheduler=scheduler,
+        location_batcher=FakeLocationBatcher(),
+        simulation_id=1,
+        simulation_instance_id=1,
+        child_simulation_id=1,
+        simulation_payload={"devices": [1], "duration": 10}
+    )
+    simulation.itineraries = []
+    itinerary = Future()
+    itinerary.set_result(np.empty((0, 2)))
+
+    simulation._start_moving_ues(itinerary)
+
+    assert ended_simulations == [1]
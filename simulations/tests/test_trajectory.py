@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 21:47:03
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 21:47:03
+
+import numpy as np
+import pytest
+import config # noqa
+from trajectory import Trajectory
+
+
+def test_ue_moves_along_the_itinerary():
+    trajectory = Trajectory(
+        itinerary=np.array([[-8.65, 40.63], [-8.65, 40.63], [-8.64, 40.63]]),
+        duration=10
+    )
+
+    assert trajectory.position_at(0) == (40.63, -8.65)
+    assert trajectory.position_at(5) == pytest.approx((40.63, -8.645))
+    assert trajectory.position_at(10) == (40.63, -8.64)
+    assert trajectory.position_at(20) == (40.63, -8.64)
+
+
+def test_ue_stays_at_a_single_position_itinerary():
+    trajectory = Trajectory(
+        itinerary=np.array([[-8.65, 40.63]]),
+        duration=10
+    )
+
+    assert trajectory.position_at(5) == (40.63, -8.65)
+
+
+def test_empty_itinerary_is_rejected():
+    with pytest.raises(ValueError):
+        Trajectory(itinerary=np.empty((0, 2)), duration=10)
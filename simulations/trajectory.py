@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# @Author: Rafael Direito
+# @Date:   2026-10-18 12:34:08
+# @Last Modified by:   Rafael Direito
+# @Last Modified time: 2026-10-18 12:34:08
+import numpy as np
+import config # noqa
+from routing import haversine_distances
+
+
+class Trajectory:
+    # Time-parameterized itinerary. The UE moves at a constant speed along
+    # the itinerary, so that it takes the simulation's duration to cover
+    # it. Each position is found through a binary search over the
+    # itinerary's timestamps, followed by an interpolation
+
+    def __init__(self, itinerary, duration):
+        if len(itinerary) == 0:
+            raise ValueError("The itinerary has no positions.")
+
+        self.duration = duration
+
+        longitudes = itinerary[:, 0]
+        latitudes = itinerary[:, 1]
+
+        segments_lengths = haversine_distances(
+            latitudes[1:], longitudes[1:], latitudes[:-1], longitudes[:-1]
+        )
+
+        # Repeated points (e.g., the end of a leg and the start of the next
+        # one) are dropped, so that the timestamps are strictly increasing
+        keep = np.concatenate(([True], segments_lengths > 0))
+        self.longitudes = np.ascontiguousarray(longitudes[keep])
+        self.latitudes = np.ascontiguousarray(latitudes[keep])
+        self.distances = np.concatenate(
+            ([0.0], np.cumsum(segments_lengths[keep[1:]]))
+        )
+        self.length = self.distances[-1]
+
+        if self.length > 0:
+            self.timestamps = self.distances / self.length * duration
+        else:
+            self.timestamps = np.zeros(1)
+
+    def position_at(self, t):
+        # Returns the (latitude, longitude) of the UE t seconds after the
+        # simulation has started
+        if t <= 0 or len(self.timestamps) == 1:
+            return float(self.latitudes[0]), float(self.longitudes[0])
+        if t >= self.duration:
+            return float(self.latitudes[-1]), float(self.longitudes[-1])
+
+        i = np.searchsorted(self.timestamps, t, side="right") - 1
+        fraction = (t - self.timestamps[i]) / \
+            (self.timestamps[i + 1] - self.timestamps[i])
+
+        return (
+            float(
+                self.latitudes[i] +
+                fraction * (self.latitudes[i + 1] - self.latitudes[i])
+            ),
+            float(
+                self.longitudes[i] +
+                fraction * (self.longitudes[i + 1] - self.longitudes[i])
+            )
+        )